@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Render saved projects to images without GUI.
+"""
+
+import argparse
+import os
+import sys
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use('Agg')
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from core import models, project, stacked
+
+FORMATS = ('png', 'svg', 'pdf')
+
+
+def render_project(filename, output, width=800, height=600, dpi=100):
+    """
+    Render project file to image.
+    :param filename: project saved by curves editor
+    :param output: image file, format is taken from extension
+    :param width: width of image in pixels
+    :param height: height of image in pixels
+    :param dpi: resolution of image
+    """
+    data = project.load(filename)
+
+    figure = Figure(figsize=(width / float(dpi), height / float(dpi)), dpi=dpi)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    ax.set_title(data.get('name'))
+    size = (ax.bbox.width, ax.bbox.height)
+
+    curves = [models.from_dict(c) for c in reversed(data.get('curves'))]
+    curves = [model for model in curves if model.is_drawable()]
+    stack = stacked.CurveStack(curves)
+    for i, samples in enumerate(stack.sample(size=size)):
+        if samples is None:
+            raise stack.errors[i]
+        xs, ys = samples[1].T
+        ax.plot(xs, ys, label=curves[i].name)
+
+    figure.savefig(output, dpi=dpi)
+
+
+def _render(task):
+    """
+    Render one project in worker process.
+    :return: filename, error :type str, str or None
+    """
+    filename, output, width, height, dpi = task
+    try:
+        render_project(filename, output, width, height, dpi)
+    except Exception as e:
+        return filename, str(e)
+    return filename, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Render projects to images without GUI.'
+    )
+    parser.add_argument('projects', nargs='+', help='project files')
+    parser.add_argument(
+        '-o',
+        '--output-dir',
+        help='directory for images, default=directory of project'
+    )
+    parser.add_argument(
+        '-f',
+        '--format',
+        choices=FORMATS,
+        default='png',
+        help='format of images, default=png'
+    )
+    parser.add_argument('--width', type=int, default=800)
+    parser.add_argument('--height', type=int, default=600)
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=None,
+        help='number of processes, default=number of CPUs'
+    )
+
+    args = parser.parse_args(argv)
+
+    tasks = []
+    for filename in args.projects:
+        name = os.path.splitext(os.path.basename(filename))[0]
+        directory = args.output_dir or os.path.dirname(filename)
+        output = os.path.join(directory, name + '.' + args.format)
+        tasks.append((filename, output, args.width, args.height, args.dpi))
+
+    pool = Pool(args.jobs)
+    try:
+        results = pool.map(_render, tasks)
+    finally:
+        pool.close()
+        pool.join()
+
+    failed = [(f, e) for f, e in results if e is not None]
+    for filename, error in failed:
+        sys.stderr.write('{}: {}\n'.format(filename, error))
+
+    return 1 if failed else 0
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import os
 
 RANGE_INFO = (
     'Wymagany format:'
@@ -23,6 +24,7 @@ SUPPORTED_FUNCTIONS = (
     '<li>cotanges -> ctg</li>'
     '<li>pierwiastek -> sqrt</li>'
     '<li>epsilon -> e</li>'
+    '<li>pi</li>'
     '</ul>'
 )
 
@@ -37,7 +39,17 @@ EXTENDED_TOOLITEMS = (
     ('Tło', 'Dodaj tło', 'background.png', 'configure_background'),
 )
 
+INTERPOLATION_MODES = (
+    ('newton', 'Postać Newtona'),
+    ('barycentric', 'Postać barycentryczna Lagrange\'a'),
+)
+
 BUTTONS = {
     'LPM': 1,
     'PPM': 3,
 }
+
+PICK_RADIUS = 5  # distance of picked point from mouse in pixels
+
+AUTOSAVE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.curves_editor')
+JOURNAL_CHECK = 1000  # time between checks of autosave errors in ms
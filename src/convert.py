@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Convert projects between JSON and binary format.
+"""
+
+import argparse
+import os
+import sys
+
+from core import project
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Convert projects between JSON and binary format.'
+    )
+    parser.add_argument('projects', nargs='+', help='project files')
+    parser.add_argument(
+        '-o',
+        '--output-dir',
+        help='directory for converted projects, default=directory of project'
+    )
+
+    args = parser.parse_args(argv)
+
+    failed = False
+    for filename in args.projects:
+        name = os.path.splitext(os.path.basename(filename))[0]
+        directory = args.output_dir or os.path.dirname(filename)
+        try:
+            if project.is_binary(filename):
+                extension = '.json'
+            else:
+                extension = project.EXTENSION
+            output = os.path.join(directory, name + extension)
+            project.convert(filename, output)
+        except (IOError, OSError, ValueError) as e:
+            sys.stderr.write('{}: {}\n'.format(filename, e))
+            failed = True
+
+    return 1 if failed else 0
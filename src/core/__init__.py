@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Geometry of curves, independent from Qt and matplotlib.
+"""
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from cache import LRUCache
+
+MAX_CACHED_BYTES = 4 * 1024 * 1024  # larger matrices are not cached
+POWER_FORM_DEGREE = 1000  # higher degrees overflow binomial coefficients
+
+_basis_cache = LRUCache(maxsize=256)
+_elevation_cache = LRUCache(maxsize=64)
+_reduction_cache = LRUCache(maxsize=64)
+
+
+def binomial(n):
+    """
+    Calculate row of binomial coefficients.
+    :param n: degree
+    :return: C(n, 0), ..., C(n, n) :type array
+    """
+    c = np.ones(n + 1)
+    for i in range(1, n + 1):
+        c[i] = c[i-1] * (n - i + 1) / float(i)
+    return c
+
+
+def log_binomial(n):
+    """
+    Calculate logarithms of row of binomial coefficients, which don't
+    overflow for high degrees.
+    :param n: degree
+    :return: log C(n, 0), ..., log C(n, n) :type array
+    """
+    k = np.arange(1, n // 2 + 1)
+    half = np.concatenate(([0.0], np.cumsum(np.log(n - k + 1.0) - np.log(k))))
+    # C(n, i) = C(n, n-i), so sums are only as long as half of row
+    return np.concatenate((half, half[:n - len(half) + 1][::-1]))
+
+
+def bernstein(n, i, t):
+    """
+    Evaluate Bernstein polynomials of degree n.
+    Above POWER_FORM_DEGREE terms are computed as logarithms, power form
+    would give inf and nan there.
+    :param n: degree
+    :param i: array of indexes of polynomials
+    :param t: array of parameters in [0, 1]
+    :return: array of shape (len(t), len(i))
+    """
+    t = np.asarray(t, dtype=float).reshape(-1, 1)
+    i = np.asarray(i)
+    if n <= POWER_FORM_DEGREE:
+        return binomial(n)[i] * t ** i * (1 - t) ** (n - i)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_t = np.where(i > 0, i * np.log(t), 0.0)
+        log_s = np.where(i < n, (n - i) * np.log1p(-t), 0.0)
+    return np.exp(log_binomial(n)[i] + log_t + log_s)
+
+
+def basis_column(n, i, t):
+    """
+    Evaluate one Bernstein polynomial without building whole basis.
+    :return: B[n, i](t) :type array of shape (len(t),)
+    """
+    return bernstein(n, [i], t)[:, 0]
+
+
+def bernstein_matrix(n, t, cache=True):
+    """
+    Build Bernstein basis matrix.
+    B[k, i] = C(n, i) * t[k]^i * (1 - t[k])^(n-i)
+    Matrices are shared by all curves of the same degree sampled
+    at the same parameters.
+    :param n: degree
+    :param t: array of parameters
+    :param cache: keep matrix in cache, off for parameters used once
+    :return: matrix of shape (len(t), n+1), read-only when cached
+    """
+    t = np.asarray(t)
+    if not cache:
+        return _bernstein_matrix(n, t)
+    return _cached(('basis', n), t, lambda: _bernstein_matrix(n, t))
+
+
+def _bernstein_matrix(n, t):
+    return bernstein(n, np.arange(n + 1), t)
+
+
+def _cached(key, t, build):
+    """
+    Get matrix from basis cache.
+    :param key: kind and degree of matrix
+    :param t: parameters, hash of their bytes is part of key
+    :param build: function building matrix when it is not cached
+    """
+    data = t.tobytes()
+    key = key + (t.dtype.str, len(t), hash(data))
+    # equal hashes of different grids are told apart by stored bytes
+    entry = _basis_cache.get(key, valid=lambda entry: entry[0] == data)
+    if entry is not None:
+        return entry[1]
+
+    matrix = build()
+    matrix.flags.writeable = False
+    if matrix.nbytes <= MAX_CACHED_BYTES:
+        _basis_cache.set(key, (data, matrix))
+    return matrix
+
+
+def bezier(points, t, cache=True):
+    """
+    Evaluate Bezier curve for all parameters at once.
+    :param points: control points of shape (n+1, d)
+    :param t: array of parameters
+    :param cache: keep basis in cache
+    :return: curve points of shape (len(t), d)
+    """
+    points = np.asarray(points, dtype=float)
+    if not len(points):
+        return np.zeros((len(t), 2))
+    return bernstein_matrix(len(points) - 1, t, cache).dot(points)
+
+
+def derivatives(points, t, cache=True):
+    """
+    Evaluate Bezier curve with its first and second derivative.
+    Works for homogeneous control points as well.
+    :param points: control points of shape (n+1, d)
+    :param t: array of parameters
+    :param cache: keep basis in cache
+    :return: points, first, second :type arrays of shape (len(t), d)
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points) - 1
+    result = []
+    for order in range(3):
+        if order <= n:
+            basis = derivative_matrix(n, order, t, cache)
+            result.append(basis.dot(points))
+        else:
+            result.append(np.zeros((len(t), points.shape[1])))
+    return tuple(result)
+
+
+def derivative_matrix(n, order, t, cache=True):
+    """
+    Build matrix of derivatives of Bernstein basis, so derivative
+    of curve is D.dot(points). Differences of hodograph are folded into
+    basis of lower degree.
+    :param n: degree
+    :param order: order of derivative
+    :param t: array of parameters
+    :param cache: keep matrix in cache
+    :return: matrix of shape (len(t), n+1), read-only when cached
+    """
+    t = np.asarray(t)
+    if not order:
+        return bernstein_matrix(n, t, cache)
+
+    def build():
+        # D = B[n-order] * difference operator applied order times
+        matrix = np.array(bernstein_matrix(n - order, t, cache))
+        for k in range(order):
+            m = n - order + k + 1
+            padded = np.zeros((len(matrix), m + 1))
+            padded[:, :-1] -= matrix
+            padded[:, 1:] += matrix
+            matrix = m * padded
+        return matrix
+
+    if not cache:
+        return build()
+    return _cached(('derivative', n, order), t, build)
+
+
+def homogeneous(points, weights):
+    """
+    Build homogeneous control points (w*x, w*y, w).
+    :param points: control points of shape (n+1, 2)
+    :param weights: array of weights
+    :return: array of shape (n+1, 3)
+    """
+    weights = np.asarray(weights, dtype=float).reshape(-1, 1)
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return np.hstack((points * weights, weights))
+
+
+def project(points):
+    """
+    Project homogeneous points back to plane.
+    :param points: array of shape (n, 3)
+    :return: points, weights :type array of shape (n, 2), array
+    """
+    points = np.asarray(points, dtype=float)
+    weights = points[:, -1]
+    return points[:, :-1] / weights.reshape(-1, 1), weights
+
+
+def rational_bezier(points, t, cache=True):
+    """
+    Evaluate rational Bezier curve for all parameters at once.
+    :param points: homogeneous control points of shape (n+1, 3)
+    :param t: array of parameters
+    :param cache: keep basis in cache
+    :return: curve points of shape (len(t), 2)
+    """
+    return project(bezier(points, t, cache))[0]
+
+
+def split(points, t):
+    """
+    Split Bezier curve at parameter t. Control points of both parts
+    are products with triangular matrices of de Casteljau algorithm.
+    Works for homogeneous control points as well.
+    :param points: control points of shape (n+1, d)
+    :param t: split parameter
+    :return: left, right :type arrays of shape (n+1, d)
+    """
+    points = np.asarray(points, dtype=float)
+    left, right = split_matrices(len(points) - 1, t)
+    return left.dot(points), right.dot(points)
+
+
+def split_matrices(n, t):
+    """
+    Build matrices of splitting Bezier curve at parameter t.
+    Row k of left is basis of degree k at t, row k of right is basis
+    of degree n-k at t shifted by k.
+    :param n: degree
+    :param t: split parameter
+    :return: left, right :type matrices of shape (n+1, n+1)
+    """
+    t = np.array([t], dtype=float)
+    left = np.zeros((n + 1, n + 1))
+    right = np.zeros((n + 1, n + 1))
+    for k in range(n + 1):
+        left[k, :k+1] = _bernstein_matrix(k, t)[0]
+        right[k, k:] = _bernstein_matrix(n - k, t)[0]
+    return left, right
+
+
+def elevation_matrix(n, m):
+    """
+    Build matrix elevating degree of Bezier curve from n to m in one step.
+    E[i, j] = C(n, j) * C(m-n, i-j) / C(m, i)
+    :param n: degree of curve
+    :param m: elevated degree, m >= n
+    :return: read-only matrix of shape (m+1, n+1)
+    """
+    key = (n, m)
+    matrix = _elevation_cache.get(key)
+    if matrix is None:
+        r = m - n
+        matrix = np.zeros((m + 1, n + 1))
+        if m <= POWER_FORM_DEGREE:
+            cn, cr, cm = binomial(n), binomial(r), binomial(m)
+            for j in range(n + 1):
+                matrix[j:j+r+1, j] = cn[j] * cr / cm[j:j+r+1]
+        else:
+            cn, cr, cm = log_binomial(n), log_binomial(r), log_binomial(m)
+            for j in range(n + 1):
+                matrix[j:j+r+1, j] = np.exp(cn[j] + cr - cm[j:j+r+1])
+        matrix.flags.writeable = False
+        _elevation_cache.set(key, matrix)
+    return matrix
+
+
+def reduction_matrix(n, m):
+    """
+    Build matrix reducing degree of Bezier curve from n to m.
+    End points are kept, inner points are least squares solution
+    of elevating reduced curve back to degree n.
+    :param n: degree of curve
+    :param m: reduced degree, 1 <= m <= n
+    :return: read-only matrix of shape (m+1, n+1)
+    """
+    key = (n, m)
+    matrix = _reduction_cache.get(key)
+    if matrix is None:
+        elevation = elevation_matrix(m, n)
+        matrix = np.zeros((m + 1, n + 1))
+        matrix[0, 0] = 1
+        matrix[m, n] = 1
+        if m > 1:
+            # points of curve left after subtracting fixed end points
+            rest = np.eye(n + 1)
+            rest[:, 0] -= elevation[:, 0]
+            rest[:, n] -= elevation[:, m]
+            matrix[1:m] = np.linalg.pinv(elevation[:, 1:m]).dot(rest)
+        matrix.flags.writeable = False
+        _reduction_cache.set(key, matrix)
+    return matrix
+
+
+def cache_stats():
+    return {
+        'basis': _basis_cache.stats,
+        'elevation': _elevation_cache.stats,
+        'reduction': _reduction_cache.stats
+    }
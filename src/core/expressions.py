@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+import ast
+import sys
+
+import numpy as np
+
+from cache import LRUCache
+
+FUNCTIONS = {
+    'sin': np.sin,
+    'cos': np.cos,
+    'tg': np.tan,
+    'ctg': lambda x: 1 / np.tan(x),
+    'sqrt': np.sqrt,
+}
+
+CONSTANTS = {
+    'pi': np.pi,
+    'e': sys.float_info.epsilon,
+}
+
+VARIABLE = 't'
+
+BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+    ast.Mod: np.mod,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: np.negative,
+    ast.UAdd: lambda x: x,
+}
+
+_cache = LRUCache(maxsize=128)
+
+
+def _number(node):
+    """
+    Get value of numeric literal.
+    :return: value or None if node is not a number
+    """
+    value = getattr(node, 'n', getattr(node, 'value', None))
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _compile(node):
+    """
+    Translate node of expression tree into function of t.
+    """
+    if isinstance(node, ast.Expression):
+        return _compile(node.body)
+
+    value = _number(node)
+    if value is not None:
+        return lambda t: value
+
+    if isinstance(node, ast.Name):
+        if node.id == VARIABLE:
+            return lambda t: t
+        if node.id in CONSTANTS:
+            constant = CONSTANTS[node.id]
+            return lambda t: constant
+        raise ValueError('Unsupported name: {}'.format(node.id))
+
+    if isinstance(node, ast.BinOp):
+        operator = BINARY_OPERATORS.get(type(node.op))
+        if operator is None:
+            raise ValueError('Unsupported operator: {}'.format(
+                type(node.op).__name__
+            ))
+        left = _compile(node.left)
+        right = _compile(node.right)
+        return lambda t: operator(left(t), right(t))
+
+    if isinstance(node, ast.UnaryOp):
+        operator = UNARY_OPERATORS.get(type(node.op))
+        if operator is None:
+            raise ValueError('Unsupported operator: {}'.format(
+                type(node.op).__name__
+            ))
+        operand = _compile(node.operand)
+        return lambda t: operator(operand(t))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name):
+            raise ValueError('Unsupported function call')
+        name = node.func.id
+        if name not in FUNCTIONS:
+            raise ValueError('Unsupported function: {}'.format(name))
+        if len(node.args) != 1 or node.keywords:
+            raise ValueError('Function {} takes one argument'.format(name))
+        function = FUNCTIONS[name]
+        argument = _compile(node.args[0])
+        return lambda t: function(argument(t))
+
+    raise ValueError('Unsupported expression: {}'.format(
+        type(node).__name__
+    ))
+
+
+def parse(func):
+    """
+    Parse curve function into safe vectorized callable.
+    :param func: function of t, e.g. 't^2 + sin(t)'
+    :return: callable evaluating whole array of t at once
+    """
+    if not func:
+        raise ValueError('Empty function')
+
+    try:
+        tree = ast.parse(func.strip().replace('^', '**'), mode='eval')
+    except SyntaxError:
+        raise ValueError('Invalid function: {}'.format(func))
+
+    body = _compile(tree)
+
+    def _function(t):
+        t = np.asarray(t, dtype=float)
+        return body(t) + np.zeros_like(t)
+
+    return _function
+
+
+def compile_expression(func):
+    """
+    Get compiled curve function, parsing it only once per text.
+    :param func: function of t
+    :return: callable evaluating whole array of t at once
+    """
+    function = _cache.get(func)
+    if function is None:
+        function = parse(func)
+        _cache.set(func, function)
+    return function
+
+
+def parse_range(range_t):
+    """
+    Parse range of parameter, e.g. '[-pi,pi,1/100]'.
+    :return: dict with min, max and interval
+    """
+    if range_t:
+        for i in ['[', ']']:
+            range_t = range_t.strip(i)
+        range_t = [
+            float(compile_expression(i)(0)) for i in range_t.split(',')
+        ]
+    else:
+        range_t = [0, 0, 0]
+
+    return {
+        'min': float(range_t[0]),
+        'max': float(range_t[1]),
+        'interval': float(range_t[2])
+    }
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Undo and redo of curve changes.
+
+History keeps small deltas instead of copies of curves. Every command
+gives changes of model as list of (action, params), where action is name
+of model method, so the same changes can be applied and appended
+to journal.
+"""
+
+from abc import ABCMeta, abstractmethod
+from collections import deque
+
+BUDGET = 16 * 1024 * 1024  # memory for history in bytes
+COMMAND_SIZE = 256  # estimated size of command without arrays
+
+Abstract = ABCMeta('Abstract', (object,), {})  # on Python 2 and 3
+
+
+class Command(Abstract):
+    """
+    Change of curve model which can be undone.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    @abstractmethod
+    def undo(self):
+        """
+        :return: list of (action, params) reverting change
+        """
+
+    @abstractmethod
+    def redo(self):
+        """
+        :return: list of (action, params) repeating change
+        """
+
+    def merge(self, command):
+        """
+        Join following command into this one.
+        :return: merged :type boolean
+        """
+        return False
+
+    @property
+    def size(self):
+        return COMMAND_SIZE
+
+
+class InsertPoint(Command):
+    def __init__(self, model, index, point):
+        super(InsertPoint, self).__init__(model)
+        self.index = index
+        self.point = point
+
+    def undo(self):
+        return [('remove_point', {'index': self.index})]
+
+    def redo(self):
+        return [('insert_point', {'index': self.index, 'point': self.point})]
+
+
+class RemovePoint(InsertPoint):
+    def undo(self):
+        return super(RemovePoint, self).redo()
+
+    def redo(self):
+        return super(RemovePoint, self).undo()
+
+
+class SetPoint(Command):
+    def __init__(self, model, index, old, new):
+        """
+        :param old: dict with x, y and w before change
+        :param new: dict with x, y and w after change
+        """
+        super(SetPoint, self).__init__(model)
+        self.index = index
+        self.old = old
+        self.new = new
+
+    def undo(self):
+        return [('set_point', {'index': self.index, 'data': self.old})]
+
+    def redo(self):
+        return [('set_point', {'index': self.index, 'data': self.new})]
+
+    def merge(self, command):
+        if not (
+            isinstance(command, SetPoint) and
+            command.model is self.model and
+            command.index == self.index
+        ):
+            return False
+
+        self.new = command.new
+        return True
+
+
+class Translate(Command):
+    def __init__(self, model, x, y):
+        super(Translate, self).__init__(model)
+        self.x = x
+        self.y = y
+
+    def undo(self):
+        return [('translate', {'x': -self.x, 'y': -self.y})]
+
+    def redo(self):
+        return [('translate', {'x': self.x, 'y': self.y})]
+
+
+class SetMode(Command):
+    def __init__(self, model, old, new):
+        super(SetMode, self).__init__(model)
+        self.old = old
+        self.new = new
+
+    def undo(self):
+        return [('set_mode', {'mode': self.old})]
+
+    def redo(self):
+        return [('set_mode', {'mode': self.new})]
+
+
+class Elevate(Command):
+    """
+    Degree elevation undone by reduction with the same number, no points
+    are kept. Used only when reduction restores points, see
+    BezierModel.reduction_restores.
+    """
+
+    def __init__(self, model, number):
+        super(Elevate, self).__init__(model)
+        self.number = number
+
+    def undo(self):
+        return [('reduce', {'number': self.number})]
+
+    def redo(self):
+        return [('elevate', {'number': self.number})]
+
+
+class SetPoints(Command):
+    """
+    Change of all points, e.g. degree reduction.
+    """
+
+    def __init__(self, model, old, new):
+        """
+        :param old: array of points before change
+        :param new: array of points after change
+        """
+        super(SetPoints, self).__init__(model)
+        self.old = old
+        self.new = new
+
+    def undo(self):
+        return [('set_points', {'points': self.old.tolist()})]
+
+    def redo(self):
+        return [('set_points', {'points': self.new.tolist()})]
+
+    @property
+    def size(self):
+        return COMMAND_SIZE + self.old.nbytes + self.new.nbytes
+
+
+class Group(Command):
+    """
+    Many changes of one curve done by one action of user.
+    """
+
+    def __init__(self, model, commands):
+        super(Group, self).__init__(model)
+        self.commands = commands
+
+    def undo(self):
+        changes = []
+        for command in reversed(self.commands):
+            changes.extend(command.undo())
+        return changes
+
+    def redo(self):
+        changes = []
+        for command in self.commands:
+            changes.extend(command.redo())
+        return changes
+
+    @property
+    def size(self):
+        return sum(command.size for command in self.commands)
+
+
+class History(object):
+    """
+    Stacks of commands limited by memory budget, oldest commands
+    are forgotten first. Size counts commands of both stacks.
+    """
+
+    def __init__(self, budget=BUDGET):
+        self.budget = budget
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.size = 0
+        self.mergeable = False
+
+    def push(self, command, merge=False):
+        """
+        Add command done by user.
+        :param command: done command
+        :param merge: join with previous command if possible,
+            e.g. following motions of dragged point
+        """
+        self.size -= sum(c.size for c in self.redo_stack)
+        self.redo_stack = []
+        self.mergeable, mergeable = merge, self.mergeable
+        if merge and mergeable and self.undo_stack:
+            if self.undo_stack[-1].merge(command):
+                return
+
+        self.undo_stack.append(command)
+        self.size += command.size
+        while self.size > self.budget and len(self.undo_stack) > 1:
+            self.size -= self.undo_stack.popleft().size
+
+    def seal(self):
+        """
+        Stop merging with last command, e.g. when drag has finished.
+        """
+        self.mergeable = False
+
+    def undo(self):
+        """
+        :return: model, changes or None when there is nothing to undo
+        """
+        if not self.undo_stack:
+            return None
+
+        command = self.undo_stack.pop()
+        self.redo_stack.append(command)
+        self.mergeable = False
+        return command.model, command.undo()
+
+    def redo(self):
+        """
+        :return: model, changes or None when there is nothing to redo
+        """
+        if not self.redo_stack:
+            return None
+
+        command = self.redo_stack.pop()
+        self.undo_stack.append(command)
+        self.mergeable = False
+        return command.model, command.redo()
+
+    def discard(self, model):
+        """
+        Forget commands of removed curve.
+        """
+        self.undo_stack = deque(
+            c for c in self.undo_stack if c.model is not model
+        )
+        self.redo_stack = [c for c in self.redo_stack if c.model is not model]
+        self.size = sum(c.size for c in self.undo_stack) + sum(
+            c.size for c in self.redo_stack
+        )
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack = []
+        self.size = 0
+        self.mergeable = False
+
+    @property
+    def stats(self):
+        return {
+            'undo': len(self.undo_stack),
+            'redo': len(self.redo_stack),
+            'size': self.size,
+            'budget': self.budget
+        }
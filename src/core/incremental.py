@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Samples of Bezier curve updated while one control point is dragged.
+
+Moving point i by delta changes curve by B_i(t) * delta, so samples on
+fixed parameters are updated in O(len(t)) with one column of basis
+instead of evaluating whole curve again.
+"""
+
+import numpy as np
+
+import evaluation
+
+REFRESH_EVERY = 64  # incremental moves between exact evaluations
+
+
+class IncrementalSamples(object):
+    """
+    Homogeneous values of polynomial or rational Bezier curve on fixed
+    grids of parameters.
+    """
+
+    def __init__(self, model, grids, refresh_every=REFRESH_EVERY):
+        """
+        :param model: Bezier or rational Bezier model
+        :param grids: list of arrays of parameters
+        :param refresh_every: number of moves between exact evaluations
+        """
+        self.model = model
+        self.grids = grids
+        self.refresh_every = refresh_every
+        self.refresh()
+
+    def refresh(self):
+        """
+        Evaluate curve exactly, error accumulated by moves is dropped.
+        """
+        self.degree = len(self.model.points) - 1
+        self.moves = 0
+        self.columns = {}
+        points = self.model.homogeneous_points
+        self.values = [
+            evaluation.bernstein_matrix(self.degree, t).dot(points)
+            for t in self.grids
+        ]
+
+    def column(self, index):
+        """
+        Get basis column of point for every grid, columns of dragged
+        point are kept.
+        """
+        if index not in self.columns:
+            self.columns[index] = [
+                evaluation.basis_column(self.degree, index, t)
+                for t in self.grids
+            ]
+        return self.columns[index]
+
+    def move(self, index, old, new):
+        """
+        Update values after point was moved, model has new point already.
+        :param old: dict with x, y and w before move
+        :param new: dict with x, y and w after move
+        """
+        if (
+            self.moves >= self.refresh_every or
+            len(self.model.points) - 1 != self.degree
+        ):
+            self.refresh()
+            return
+
+        delta = (
+            self.model.homogeneous_point(new) -
+            self.model.homogeneous_point(old)
+        )
+        for values, column in zip(self.values, self.column(index)):
+            values += np.outer(column, delta)
+        self.moves += 1
+
+    def samples(self):
+        """
+        :return: t, points for every grid :type list
+        """
+        return [
+            (t, values[:, :2] / values[:, 2:])
+            for t, values in zip(self.grids, self.values)
+        ]
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+class DividedDifferences(object):
+    """
+    Newton form of interpolating polynomial.
+    Keeps last row of divided differences table, so adding node
+    at the end costs O(n).
+    """
+
+    def __init__(self, xs=(), ys=()):
+        self.build(xs, ys)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def build(self, xs, ys):
+        """
+        Calculate coefficients from scratch in O(n^2).
+        """
+        self.nodes = np.array(xs, dtype=float)
+        self.values = np.array(ys, dtype=float)
+        self.coefficients = np.array(ys, dtype=float)
+        # tail[j] = f[x(n-j), ..., x(n)]
+        self.tail = np.zeros(len(self.nodes))
+
+        n = len(self.nodes)
+        b = self.coefficients
+        if n:
+            self.tail[0] = b[-1]
+        for i in range(1, n):
+            b[i:] = (b[i:] - b[i-1:-1]) / (self.nodes[i:] - self.nodes[:-i])
+            self.tail[i] = b[-1]
+
+    def append(self, x, y):
+        """
+        Add node at the end.
+        :param x: node
+        :param y: value at node
+        """
+        n = len(self.nodes)
+        tail = np.empty(n + 1)
+        tail[0] = y
+        for j in range(1, n + 1):
+            tail[j] = (tail[j-1] - self.tail[j-1]) / (x - self.nodes[n-j])
+
+        self.nodes = np.append(self.nodes, x)
+        self.values = np.append(self.values, y)
+        self.coefficients = np.append(self.coefficients, tail[n])
+        self.tail = tail
+
+    def insert(self, index, x, y):
+        if index == len(self.nodes):
+            self.append(x, y)
+        else:
+            self.build(
+                np.insert(self.nodes, index, x),
+                np.insert(self.values, index, y)
+            )
+
+    def remove(self, index):
+        self.build(
+            np.delete(self.nodes, index),
+            np.delete(self.values, index)
+        )
+
+    def set_node(self, index, x, y):
+        nodes = self.nodes.copy()
+        values = self.values.copy()
+        nodes[index] = x
+        values[index] = y
+        self.build(nodes, values)
+
+    def evaluate(self, xs):
+        """
+        Calculate newton polynomial with Horner scheme.
+        :param xs: array of nodes to interpolate at
+        :return: array of interpolated values
+        """
+        xs = np.asarray(xs, dtype=float)
+        b = self.coefficients
+        n = len(b) - 1
+        ys = np.zeros_like(xs)
+        if n < 0:
+            return ys
+
+        ys += b[n]
+        for k in range(n - 1, -1, -1):
+            ys *= xs - self.nodes[k]
+            ys += b[k]
+        return ys
+
+
+class Barycentric(object):
+    """
+    Barycentric form of Lagrange interpolating polynomial.
+    Weights are calculated once in O(n^2) and updated in O(n)
+    when node is added or removed.
+    """
+
+    def __init__(self, xs=(), ys=()):
+        self.build(xs, ys)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def build(self, xs, ys):
+        """
+        Calculate weights from scratch in O(n^2).
+        """
+        self.nodes = np.array(xs, dtype=float)
+        self.values = np.array(ys, dtype=float)
+
+        # common factor of all weights, keeps products in float range
+        self.scale = 1.0
+        if len(self.nodes) > 1:
+            length = self.nodes.max() - self.nodes.min()
+            if length > 0:
+                self.scale = 4 / length
+
+        diff = (self.nodes.reshape(-1, 1) - self.nodes) * self.scale
+        np.fill_diagonal(diff, 1)
+        self.weights = 1 / diff.prod(axis=1)
+
+    def _differences(self, x):
+        return (self.nodes - x) * self.scale
+
+    def append(self, x, y):
+        self.insert(len(self.nodes), x, y)
+
+    def insert(self, index, x, y):
+        """
+        Add node at index.
+        :param index: position of new node
+        :param x: node
+        :param y: value at node
+        """
+        diff = self._differences(x)
+        weights = self.weights / diff
+        weight = 1 / np.prod(-diff)
+
+        self.weights = np.insert(weights, index, weight)
+        self.nodes = np.insert(self.nodes, index, x)
+        self.values = np.insert(self.values, index, y)
+
+    def remove(self, index):
+        """
+        Remove node at index.
+        """
+        x = self.nodes[index]
+        self.nodes = np.delete(self.nodes, index)
+        self.values = np.delete(self.values, index)
+        self.weights = np.delete(self.weights, index) * self._differences(x)
+
+    def set_node(self, index, x, y):
+        if x != self.nodes[index]:
+            self.remove(index)
+            self.insert(index, x, y)
+        else:
+            self.values[index] = y
+
+    def evaluate(self, xs):
+        """
+        Calculate interpolating polynomial with second barycentric formula.
+        :param xs: array of nodes to interpolate at
+        :return: array of interpolated values
+        """
+        xs = np.asarray(xs, dtype=float)
+        if not len(self.nodes):
+            return np.zeros_like(xs)
+
+        diff = xs.reshape(-1, 1) - self.nodes
+        exact = diff == 0
+        diff[exact] = 1
+
+        temp = self.weights / diff
+        ys = temp.dot(self.values) / temp.sum(axis=1)
+
+        rows, columns = np.nonzero(exact)
+        ys[rows] = self.values[columns]
+        return ys.reshape(xs.shape)
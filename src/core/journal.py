@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only journal of curve changes.
+
+Every change is one JSON line appended by background thread, so recording
+it costs only putting entry on queue. Points in entries are shared point
+sets, they are converted to lists by the thread. Journal is periodically
+compacted into snapshot of whole project. After crash project is recovered from
+snapshot and entries appended after it.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+import models
+import project
+from point import PointSet
+
+COMPACT_EVERY = 1000
+JOURNAL = 'autosave.journal'
+SNAPSHOT = 'autosave' + project.EXTENSION
+
+# changes applied by calling method of curve model with entry params
+MODEL_ACTIONS = (
+    'insert_point', 'set_point', 'remove_point', 'translate',
+    'elevate', 'reduce', 'set_mode', 'set_points'
+)
+
+
+class Journal(object):
+    """
+    Journal of changes written in background thread.
+    """
+
+    def __init__(self, directory, snapshot, compact_every=COMPACT_EVERY):
+        """
+        :param directory: directory for journal and snapshot
+        :param snapshot: function returning project with copied points
+        :param compact_every: number of entries between compactions
+        """
+        self.directory = directory
+        self.snapshot = snapshot
+        self.compact_every = compact_every
+        self.sequence = 0
+        self.entries = 0
+        self.written = 0
+        self.compactions = 0
+        self.errors = []
+        self.reported = 0
+        self.queue = Queue()
+        self.thread = None
+
+    @property
+    def journal_path(self):
+        return os.path.join(self.directory, JOURNAL)
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, SNAPSHOT)
+
+    def start(self):
+        if self.thread is not None:
+            return
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def record(self, action, curve=None, **params):
+        """
+        Append change to journal.
+        :param action: name of change
+        :param curve: name of changed curve
+        :param params: params of change, JSON serializable or shared
+            PointSet given up by journal after writing
+        """
+        if self.thread is None:
+            return
+
+        self.sequence += 1
+        params['a'] = action
+        params['n'] = self.sequence
+        if curve is not None:
+            params['c'] = curve
+        self.queue.put(('entry', params))
+
+        self.entries += 1
+        if self.entries >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """
+        Replace journal with snapshot of whole project.
+        """
+        if self.thread is None:
+            return
+
+        data = self.snapshot()
+        data['sequence'] = self.sequence
+        self.entries = 0
+        self.queue.put(('snapshot', data))
+
+    def new_errors(self):
+        """
+        Get errors of writer thread which were not taken yet.
+        """
+        errors = self.errors[self.reported:]
+        self.reported += len(errors)
+        return errors
+
+    def flush(self):
+        """
+        Wait until all recorded changes are written.
+        """
+        self.queue.join()
+
+    def close(self, discard=False):
+        """
+        Stop writer thread.
+        :param discard: remove journal and snapshot
+        """
+        if self.thread is not None:
+            self.queue.put(('stop', None))
+            self.thread.join()
+            self.thread = None
+        if discard:
+            self.discard()
+
+    def discard(self):
+        for path in (self.journal_path, self.snapshot_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _run(self):
+        journal = open(self.journal_path, 'a')
+        while True:
+            kind, value = self.queue.get()
+            try:
+                if kind == 'entry':
+                    journal.write(dumps(value))
+                    journal.write('\n')
+                    self.written += 1
+                elif kind == 'snapshot':
+                    journal.close()
+                    try:
+                        self._write_snapshot(value)
+                    finally:
+                        release(value)
+                    journal = open(self.journal_path, 'w')
+                    self.compactions += 1
+                elif kind == 'stop':
+                    break
+
+                if self.queue.empty():
+                    journal.flush()
+            except (IOError, OSError, TypeError, ValueError) as e:
+                self.errors.append(e)
+            finally:
+                self.queue.task_done()
+        journal.close()
+
+    def _write_snapshot(self, data):
+        project.save(self.snapshot_path, data, binary=True)
+
+
+def dumps(entry):
+    """
+    Serialize entry, shared point sets are written as lists and released.
+    """
+    shared = []
+
+    def default(value):
+        if isinstance(value, PointSet):
+            shared.append(value)
+            return value.array.tolist()
+        raise TypeError('{!r} is not JSON serializable'.format(value))
+
+    try:
+        return json.dumps(entry, separators=(',', ':'), default=default)
+    finally:
+        for points in shared:
+            points.release()
+
+
+def release(data):
+    """
+    Give up points of snapshot shared with curves.
+    """
+    for curve in data.get('curves', ()):
+        points = curve.get('data', {}).get('points')
+        if isinstance(points, PointSet):
+            points.release()
+
+
+def read_entries(path):
+    """
+    Read entries of journal, incomplete last line is skipped.
+    """
+    entries = []
+    if not os.path.exists(path):
+        return entries
+
+    with open(path) as infile:
+        for line in infile:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+    return entries
+
+
+def apply(curves, entry):
+    """
+    Apply journal entry to curve models.
+    :param curves: OrderedDict of curve models by name
+    :param entry: journal entry
+    """
+    params = dict(entry)
+    action = params.pop('a')
+    name = params.pop('c', None)
+    params.pop('n', None)
+
+    if action == 'add_curve':
+        model = models.from_dict(params.get('model'))
+        curves[model.name] = model
+    elif action == 'remove_curve':
+        del curves[name]
+    elif action == 'set_data':
+        model = curves.pop(name)
+        model.set_data(model.load(params.get('data')))
+        curves[model.name] = model
+    elif action in MODEL_ACTIONS:
+        getattr(curves[name], action)(**params)
+    else:
+        raise ValueError('unknown journal action {}'.format(action))
+
+
+def recover(directory):
+    """
+    Rebuild project from snapshot and journal.
+    :param directory: directory with journal and snapshot
+    :return: project or None when there is nothing to recover
+    """
+    snapshot_path = os.path.join(directory, SNAPSHOT)
+    if not os.path.exists(snapshot_path):
+        return None
+
+    data = project.load(snapshot_path, mmap=False)
+    sequence = data.get('sequence', 0)
+    curves = OrderedDict(
+        (c['data']['name'], models.from_dict(c)) for c in data['curves']
+    )
+
+    for entry in read_entries(os.path.join(directory, JOURNAL)):
+        if entry.get('n', 0) <= sequence:
+            continue
+        try:
+            apply(curves, entry)
+        except (
+            AttributeError, KeyError, IndexError, TypeError, ValueError
+        ):
+            continue
+
+    return project.from_models(data.get('name'), list(curves.values()))
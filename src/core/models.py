@@ -0,0 +1,547 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABCMeta, abstractmethod
+
+import numpy as np
+
+import evaluation
+import expressions
+import interpolation
+import sampling
+import spatial
+from point import PointSet
+
+
+DERIVATIVE_STEP = 1e-5  # step of central differences relative to domain
+RESTORE_TOLERANCE = 1e-12  # error of reduction undoing elevation
+RESTORE_DEGREE = 200  # highest degree checked, reduction matrix is O(n^3)
+
+Abstract = ABCMeta('Abstract', (object,), {})  # on Python 2 and 3
+
+
+class CurveModel(Abstract):
+    """
+    Geometry of curve: control points and evaluation.
+    """
+    type = None
+
+    def __init__(self, name=None):
+        self.name = name
+        self.grid = None
+        self.points = PointSet()
+
+    @property
+    def points(self):
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        if points is getattr(self, '_points', None):
+            return
+        if not isinstance(points, PointSet):
+            points = PointSet(points)
+        self._points = points
+        self.points_changed()
+
+    @staticmethod
+    def load(data):
+        """
+        Convert saved data into data accepted by set_data.
+        """
+        return dict(data)
+
+    def set_data(self, data):
+        """
+        Update curve with data from dialog or load.
+        Keys missing in data are left unchanged.
+        """
+        if 'name' in data:
+            self.name = data.get('name')
+        if 'points' in data:
+            self.points = data.get('points')
+
+    def settings(self):
+        """
+        Get data to save in project except points.
+        """
+        return {'name': self.name}
+
+    def save(self):
+        """
+        Get data to save in project.
+        """
+        data = self.settings()
+        data['points'] = self.points.array.tolist()
+        return data
+
+    def save_shared(self):
+        """
+        Get data to save in project with points shared in O(1)
+        instead of copied into list.
+        """
+        data = self.settings()
+        data['points'] = self.points.share()
+        return data
+
+    def to_dict(self, shared=False):
+        return {
+            'data': self.save_shared() if shared else self.save(),
+            'type': self.type
+        }
+
+    @classmethod
+    def from_dict(cls, curve):
+        """
+        Build curve from entry of project 'curves' list.
+        """
+        model = cls()
+        model.set_data(cls.load(curve.get('data')))
+        return model
+
+    def is_drawable(self):
+        return len(self.points) >= 2
+
+    def bounds(self):
+        """
+        Get bounding box of control points, cheap estimate of curve
+        extent computed without evaluating it.
+        :return: x_min, y_min, x_max, y_max or None when unknown
+        """
+        if not len(self.points):
+            return None
+        xs, ys = self.points.xs, self.points.ys
+        return xs.min(), ys.min(), xs.max(), ys.max()
+
+    def domain(self):
+        """
+        Get parameter range of whole curve.
+        :return: t_min, t_max, step of initial samples or 0
+        """
+        return 0, 1, 0
+
+    @abstractmethod
+    def evaluate(self, t, cache=True):
+        """
+        Evaluate curve for array of parameters.
+        :param t: array of parameters
+        :param cache: parameters may be used again, so values computed
+            for them can be cached
+        :return: points :type array of shape (len(t), 2)
+        """
+
+    def derivatives(self, t, cache=True):
+        """
+        Evaluate curve with its first and second derivative, by central
+        differences when model has no exact formula.
+        :param t: array of parameters
+        :param cache: parameters may be used again
+        :return: points, first, second :type arrays of shape (len(t), 2)
+        """
+        t = np.asarray(t, dtype=float)
+        t_min, t_max = self.domain()[:2]
+        h = DERIVATIVE_STEP * ((t_max - t_min) or 1)
+        before, points, after = np.split(
+            self.evaluate(np.concatenate((t - h, t, t + h)), cache), 3
+        )
+        first = (after - before) / (2 * h)
+        second = (after - 2 * points + before) / (h * h)
+        return points, first, second
+
+    def sample(self, transform=None, size=(800, 600)):
+        """
+        Sample whole curve adaptively.
+        :return: t, points :type array, array of shape (n, 2)
+        """
+        t_min, t_max, step = self.domain()
+        return sampling.adaptive(
+            self.evaluate, t_min, t_max, transform, size=size, step=step
+        )
+
+    def insert_point(self, index, point):
+        """
+        Insert point, at the end when index is None.
+        :return: index of new point
+        """
+        if index is None:
+            index = len(self.points)
+        self.points.insert(index, point)
+        self.point_added(index)
+        return index
+
+    def set_point(self, index, data):
+        """
+        Change point.
+        :param data: dict with new x and y
+        """
+        point = self.points[index]
+        if data.get('x') is not None:
+            point.x = data.get('x')
+        if data.get('y') is not None:
+            point.y = data.get('y')
+        self.point_edited(index)
+
+    def remove_point(self, index):
+        del self.points[index]
+        self.point_removed(index)
+
+    def translate(self, x, y):
+        self.points.translate(x, y)
+        self.points_changed()
+
+    def set_points(self, points):
+        self.points = points
+
+    def spatial_index(self):
+        """
+        Get index of control points, built when needed.
+        :return: index :type GridIndex
+        """
+        if self.grid is None:
+            self.grid = spatial.GridIndex(self.points.array[:, :2])
+        return self.grid
+
+    def point_added(self, index):
+        """
+        Called after point was inserted at index.
+        """
+        if self.grid is not None:
+            self.grid.insert(index, self.points[index].cord)
+
+    def point_edited(self, index):
+        """
+        Called after point at index was changed.
+        """
+        if self.grid is not None:
+            self.grid.move(index, self.points[index].cord)
+
+    def point_removed(self, index):
+        """
+        Called after point at index was removed.
+        """
+        if self.grid is not None:
+            self.grid.remove(index)
+
+    def points_changed(self):
+        """
+        Called after all points were changed at once.
+        """
+        self.grid = None
+
+
+class ParametricModel(CurveModel):
+    type = 'PARAM'
+
+    def __init__(self, name=None):
+        super(ParametricModel, self).__init__(name)
+        self.range = None
+        self.function_x = None
+        self.function_y = None
+        self.translation = [0, 0]
+
+    def set_data(self, data):
+        super(ParametricModel, self).set_data(data)
+        for key in ('range', 'function_x', 'function_y'):
+            if key in data:
+                setattr(self, key, data.get(key))
+        if 'translation' in data:
+            self.translation = list(data.get('translation'))
+
+    def settings(self):
+        return {
+            'name': self.name,
+            'range': self.range,
+            'function_x': self.function_x,
+            'function_y': self.function_y,
+            'translation': self.translation
+        }
+
+    def save(self):
+        return self.settings()
+
+    save_shared = save
+
+    def is_drawable(self):
+        return True
+
+    def domain(self):
+        range_t = expressions.parse_range(self.range)
+        return (
+            range_t.get('min'),
+            range_t.get('max'),
+            range_t.get('interval')
+        )
+
+    def evaluate(self, t, cache=True):
+        function_x = expressions.compile_expression(self.function_x)
+        function_y = expressions.compile_expression(self.function_y)
+
+        return np.column_stack((
+            function_x(t) + self.translation[0],
+            function_y(t) + self.translation[1]
+        ))
+
+    def translate(self, x, y):
+        self.translation[0] += x
+        self.translation[1] += y
+
+
+class NewtonModel(CurveModel):
+    type = 'NEWTON'
+
+    INTERPOLANTS = {
+        'newton': interpolation.DividedDifferences,
+        'barycentric': interpolation.Barycentric,
+    }
+
+    def __init__(self, name=None):
+        self.mode = 'newton'
+        self.interpolant = None
+        super(NewtonModel, self).__init__(name)
+
+    @staticmethod
+    def load(data):
+        data = dict(data)
+        data.setdefault('mode', 'newton')
+        return data
+
+    def set_data(self, data):
+        if 'mode' in data:
+            self.set_mode(data.get('mode'))
+        super(NewtonModel, self).set_data(data)
+
+    def settings(self):
+        data = super(NewtonModel, self).settings()
+        data['mode'] = self.mode
+        return data
+
+    def domain(self):
+        return self.points[0].x, self.points[-1].x, 0
+
+    def evaluate(self, t, cache=True):
+        t = np.asarray(t, dtype=float)
+        return np.column_stack((t, self.get_interpolant().evaluate(t)))
+
+    def get_interpolant(self):
+        """
+        Get cached interpolant for current mode.
+        :return: interpolant :type DividedDifferences or Barycentric
+        """
+        if self.interpolant is None:
+            self.interpolant = self.INTERPOLANTS[self.mode](
+                self.points.xs, self.points.ys
+            )
+        return self.interpolant
+
+    def set_mode(self, mode):
+        """
+        Change interpolation mode.
+        :param mode: 'newton' or 'barycentric'
+        """
+        if mode != self.mode:
+            self.mode = mode
+            self.interpolant = None
+
+    def point_added(self, index):
+        super(NewtonModel, self).point_added(index)
+        if self.interpolant is not None:
+            p = self.points[index]
+            self.interpolant.insert(index, p.x, p.y)
+
+    def point_edited(self, index):
+        super(NewtonModel, self).point_edited(index)
+        if self.interpolant is not None:
+            p = self.points[index]
+            self.interpolant.set_node(index, p.x, p.y)
+
+    def point_removed(self, index):
+        super(NewtonModel, self).point_removed(index)
+        if self.interpolant is not None:
+            self.interpolant.remove(index)
+
+    def points_changed(self):
+        super(NewtonModel, self).points_changed()
+        self.interpolant = None
+
+    def coefficients(self):
+        """
+        Calculate coefficients of Newton form.
+        :return: an array of coefficient
+        """
+        if self.mode == 'newton':
+            return self.get_interpolant().coefficients
+        return interpolation.DividedDifferences(
+            self.points.xs, self.points.ys
+        ).coefficients
+
+    def to_bezier(self):
+        xp = self.points.xs
+        n = len(xp) - 1
+        if n < 1:
+            return []
+
+        b = self.coefficients()
+        c = np.zeros(n+1)
+        c[n] = b[n]
+
+        for k in range(n-1, -1, -1):
+            t = 1 - xp[k]
+            for i in range(k, n):
+                c[i] = (t * (i-k) * c[i] - xp[k] * (n-i) * c[i+1]) / (n-k) + b[k]
+        return list(c)
+
+
+class BezierModel(CurveModel):
+    type = 'BEZIER'
+
+    def evaluate(self, t, cache=True):
+        return evaluation.bezier(self.points.array[:, :2], t, cache)
+
+    def derivatives(self, t, cache=True):
+        return evaluation.derivatives(self.points.array[:, :2], t, cache)
+
+    def split(self, t):
+        """
+        Split curve at parameter t.
+        :return: left, right :type PointSet, PointSet
+        """
+        left, right = evaluation.split(self.points.array[:, :2], t)
+        return split_points(left, right)
+
+    def elevate(self, number):
+        """
+        Elevate degree by number at once with elevation matrix.
+        """
+        n = len(self.points) - 1
+        if number <= 0 or n < 0:
+            return
+        matrix = evaluation.elevation_matrix(n, n + number)
+        self.set_homogeneous(matrix.dot(self.homogeneous_points))
+
+    def reduce(self, number):
+        """
+        Reduce degree by number at once with least squares reduction
+        matrix, end points are kept. Degree is not reduced below 1.
+        """
+        n = len(self.points) - 1
+        m = max(n - number, 1)
+        if m >= n:
+            return
+        matrix = evaluation.reduction_matrix(n, m)
+        self.set_homogeneous(matrix.dot(self.homogeneous_points))
+
+    def reduction_restores(self, points, tolerance=RESTORE_TOLERANCE):
+        """
+        Check if reduction to degree of given points gives them back,
+        i.e. elevation from them can be undone without their copy.
+        Reduction is least squares, it loses precision at high degrees.
+        :param points: homogeneous points of lower degree
+        :return: restored :type boolean
+        """
+        n, m = len(self.points) - 1, len(points) - 1
+        if m < 1 or m > n or n > RESTORE_DEGREE:
+            return False
+        restored = evaluation.reduction_matrix(n, m).dot(
+            self.homogeneous_points
+        )
+        scale = max(np.abs(points).max(), 1.0)
+        return np.abs(restored - points).max() <= tolerance * scale
+
+    @property
+    def homogeneous_points(self):
+        """
+        Control points (x, y, 1), weights are not used by polynomial curve.
+        """
+        return evaluation.homogeneous(
+            self.points.array[:, :2], np.ones(len(self.points))
+        )
+
+    @staticmethod
+    def homogeneous_point(data):
+        """
+        :param data: dict with x, y and w
+        :return: x, y, 1 :type array
+        """
+        return np.array([data.get('x'), data.get('y'), 1.0])
+
+    def set_homogeneous(self, points):
+        self.points = PointSet.from_array(points[:, :2])
+
+
+class RationalBezierModel(BezierModel):
+    type = 'RATIONAL_BEZIER'
+
+    @property
+    def homogeneous_points(self):
+        return evaluation.homogeneous(
+            self.points.array[:, :2], self.points.weights
+        )
+
+    @staticmethod
+    def homogeneous_point(data):
+        """
+        :param data: dict with x, y and w
+        :return: w*x, w*y, w :type array
+        """
+        w = data.get('w')
+        return np.array([w * data.get('x'), w * data.get('y'), w])
+
+    def set_homogeneous(self, points):
+        self.points = PointSet.from_array(*evaluation.project(points))
+
+    def set_point(self, index, data):
+        if data.get('w'):
+            self.points[index].weight = data.get('w')
+        super(RationalBezierModel, self).set_point(index, data)
+
+    def evaluate(self, t, cache=True):
+        return evaluation.rational_bezier(self.homogeneous_points, t, cache)
+
+    def derivatives(self, t, cache=True):
+        """
+        Derivatives of quotient of homogeneous curve P(t) and weight w(t).
+        """
+        P, P1, P2 = evaluation.derivatives(
+            self.homogeneous_points, t, cache
+        )
+        w, w1, w2 = P[:, 2:], P1[:, 2:], P2[:, 2:]
+        points = P[:, :2] / w
+        first = (P1[:, :2] - points * w1) / w
+        second = (P2[:, :2] - 2 * first * w1 - points * w2) / w
+        return points, first, second
+
+    def split(self, t):
+        left, right = evaluation.split(self.homogeneous_points, t)
+        return split_points(
+            np.column_stack(evaluation.project(left)),
+            np.column_stack(evaluation.project(right))
+        )
+
+
+def split_points(left, right):
+    """
+    Store points of both parts of split curve in one array,
+    common point is stored once.
+    :param left: array of rows (x, y) or (x, y, weight)
+    :param right: array of rows starting with last row of left
+    :return: left, right :type PointSet, PointSet
+    """
+    n = len(left)
+    rows = np.ones((2 * n - 1, 3))
+    rows[:n, :left.shape[1]] = left
+    rows[n:, :right.shape[1]] = right[1:]
+    return PointSet.from_views(rows, (slice(0, n), slice(n - 1, 2 * n - 1)))
+
+
+MODEL_TYPES = {
+    'PARAM': ParametricModel,
+    'NEWTON': NewtonModel,
+    'BEZIER': BezierModel,
+    'RATIONAL_BEZIER': RationalBezierModel
+}
+
+
+def from_dict(curve):
+    """
+    Build curve model from entry of project 'curves' list.
+    """
+    return MODEL_TYPES[curve.get('type')].from_dict(curve)
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+class Point(object):
+    def __init__(self, x=None, y=None, weight=1.0):
+        self.x = x
+        self.y = y
+        self.weight = weight
+
+    @property
+    def cord(self):
+        return self.x, self.y
+
+    def update(self, x, y):
+        self.x += x
+        self.y += y
+
+    def save(self):
+        return (
+            self.x,
+            self.y,
+            self.weight
+        )
+
+
+class PointProxy(object):
+    """
+    Point stored in PointSet. Valid until points before it are
+    inserted or removed.
+    """
+    __slots__ = ('points', 'index')
+
+    def __init__(self, points, index):
+        self.points = points
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.points.array[self.index, 0])
+
+    @x.setter
+    def x(self, value):
+        self.points.writable()[self.index, 0] = value
+
+    @property
+    def y(self):
+        return float(self.points.array[self.index, 1])
+
+    @y.setter
+    def y(self, value):
+        self.points.writable()[self.index, 1] = value
+
+    @property
+    def weight(self):
+        return float(self.points.array[self.index, 2])
+
+    @weight.setter
+    def weight(self, value):
+        self.points.writable()[self.index, 2] = value
+
+    @property
+    def cord(self):
+        return self.x, self.y
+
+    def update(self, x, y):
+        self.x += x
+        self.y += y
+
+    def save(self):
+        return tuple(float(v) for v in self.points.array[self.index])
+
+
+class PointSet(object):
+    """
+    Points stored in one contiguous array of rows (x, y, weight).
+    Array can be shared by many point sets, it is copied on first change.
+    """
+
+    def __init__(self, points=()):
+        values = [self._values(p) for p in points]
+        self.size = len(values)
+        self.data = np.zeros((max(self.size, 4), 3))
+        self.refs = [1]  # number of point sets sharing data
+        if values:
+            self.data[:self.size] = values
+
+    @staticmethod
+    def _values(point):
+        if hasattr(point, 'save'):
+            return point.save()
+        point = tuple(point)
+        if len(point) == 2:
+            point += (1.0,)
+        return point
+
+    @classmethod
+    def from_array(cls, array, weights=None):
+        """
+        Build point set from array of shape (n, 2) or (n, 3).
+        """
+        array = np.asarray(array, dtype=float)
+        points = cls()
+        points.size = len(array)
+        points.data = np.ones((max(points.size, 4), 3))
+        points.data[:points.size, :array.shape[1]] = array
+        if weights is not None:
+            points.data[:points.size, 2] = weights
+        return points
+
+    @classmethod
+    def from_buffer(cls, array):
+        """
+        Build point set over existing array of shape (n, 3) without
+        copying it, e.g. over memory-mapped block of project file.
+        """
+        points = cls()
+        points.size = len(array)
+        points.data = array
+        return points
+
+    @classmethod
+    def from_views(cls, array, slices):
+        """
+        Build point sets sharing one array of shape (n, 3), points
+        of every set are given slice of rows.
+        """
+        sets = [cls.from_buffer(array[s]) for s in slices]
+        refs = [len(sets)]
+        for points in sets:
+            points.refs = refs
+        return sets
+
+    def share(self):
+        """
+        Get copy of point set in O(1), data is copied on first change
+        of any of them.
+        """
+        points = PointSet.from_buffer(self.data)
+        points.size = self.size
+        points.refs = self.refs
+        self.refs[0] += 1
+        return points
+
+    def release(self):
+        """
+        Give up share of data, point set must not be used afterwards.
+        Called when point set is dropped, can be called earlier.
+        """
+        refs = getattr(self, 'refs', None)
+        if refs and refs[0] > 0:
+            refs[0] -= 1
+        self.refs = [0]
+
+    def __del__(self):
+        self.release()
+
+    @property
+    def shared(self):
+        return self.refs[0] > 1
+
+    def writable(self):
+        """
+        Get array of points which can be changed, shared data is copied.
+        """
+        if self.shared:
+            self.refs[0] -= 1
+            self.refs = [1]
+            self.data = self.data[:max(self.size, 4)].copy()
+        return self.data[:self.size]
+
+    def memory(self):
+        """
+        Get size of data in bytes.
+        :return: dict with owned, shared and mapped bytes
+        """
+        report = {'owned': 0, 'shared': 0, 'mapped': 0}
+        if isinstance(self.data, np.memmap) or \
+                isinstance(self.data.base, np.memmap):
+            report['mapped'] = self.data.nbytes
+        elif self.shared:
+            report['shared'] = self.data.nbytes
+        else:
+            report['owned'] = self.data.nbytes
+        return report
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield PointProxy(self, i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [PointProxy(self, i) for i in range(self.size)[index]]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('point index out of range')
+        return PointProxy(self, index)
+
+    def __delitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('point index out of range')
+        self.writable()
+        self.data[index:self.size-1] = self.data[index+1:self.size].copy()
+        self.size -= 1
+
+    def _reserve(self, size):
+        if size > len(self.data):
+            data = np.zeros((max(size, 2 * len(self.data)), 3))
+            data[:self.size] = self.data[:self.size]
+            self.refs[0] -= 1
+            self.refs = [1]
+            self.data = data
+        else:
+            self.writable()
+
+    def insert(self, index, point):
+        if index < 0:
+            index += self.size
+        index = min(max(index, 0), self.size)
+        values = self._values(point)
+        self._reserve(self.size + 1)
+        self.data[index+1:self.size+1] = self.data[index:self.size].copy()
+        self.data[index] = values
+        self.size += 1
+
+    def append(self, point):
+        self.insert(self.size, point)
+
+    def translate(self, x, y):
+        self.writable()[:, :2] += (x, y)
+
+    def copy(self):
+        return PointSet.from_array(self.array)
+
+    @property
+    def array(self):
+        """
+        Points as array of rows, read only when data is shared.
+        """
+        array = self.data[:self.size]
+        if self.shared:
+            array = array.view()
+            array.flags.writeable = False
+        return array
+
+    @property
+    def xs(self):
+        return self.array[:, 0]
+
+    @property
+    def ys(self):
+        return self.array[:, 1]
+
+    @property
+    def weights(self):
+        return self.array[:, 2]
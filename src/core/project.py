@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Reading and writing project files.
+
+Projects are saved as JSON or in binary format:
+    magic | header length | JSON header | float64 blocks of points
+
+Header has the same structure as JSON project, but points of every curve
+are stored in one contiguous block of rows (x, y, weight) after header.
+Blocks are memory-mapped, so points are read when curve uses them.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from point import PointSet
+
+MAGIC = b'CRVPRJ01'
+EXTENSION = '.crv'
+ALIGNMENT = 8
+DTYPE = np.dtype('<f8')
+
+
+def is_binary(filename):
+    with open(filename, 'rb') as infile:
+        return infile.read(len(MAGIC)) == MAGIC
+
+
+def load(filename, mmap=True):
+    """
+    Read project in any format.
+    :param filename: project file
+    :param mmap: map points of binary project instead of reading them
+    :return: project :type dict
+    """
+    if is_binary(filename):
+        return read(filename, mmap)
+    return read_json(filename)
+
+
+def save(filename, project, binary=None):
+    """
+    Write project, format is chosen by extension of filename.
+    Project is written to temporary file which then replaces filename,
+    so points mapped from the same file stay valid while writing.
+    :param binary: binary format, chosen by extension when None
+    """
+    if binary is None:
+        binary = os.path.splitext(filename)[1] == EXTENSION
+
+    path = filename + '.tmp'
+    try:
+        if binary:
+            write(path, project)
+        else:
+            write_json(path, project)
+        replace(path, filename)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def replace(source, target):
+    """
+    Move source over target.
+    """
+    if hasattr(os, 'replace'):
+        os.replace(source, target)
+        return
+    if os.name == 'nt' and os.path.exists(target):
+        os.remove(target)
+    os.rename(source, target)
+
+
+def convert(source, target):
+    save(target, load(source, mmap=False))
+
+
+def from_models(name, models):
+    """
+    Build project from curve models, points are shared, not copied.
+    :param name: name of figure
+    :param models: list of curve models
+    :return: project :type dict
+    """
+    return {
+        'name': name,
+        'curves': [model.to_dict(shared=True) for model in models]
+    }
+
+
+def read_json(filename):
+    with open(filename) as infile:
+        return json.load(infile)
+
+
+def write_json(filename, project):
+    curves = []
+    for curve in project.get('curves'):
+        data = dict(curve.get('data'))
+        if 'points' in data:
+            data['points'] = _points_array(data['points']).tolist()
+        curves.append({'data': data, 'type': curve.get('type')})
+
+    with open(filename, 'w') as outfile:
+        json.dump(dict(project, curves=curves), outfile)
+
+
+def read(filename, mmap=True):
+    """
+    Read binary project.
+    :param filename: project file
+    :param mmap: map points instead of reading them
+    :return: project, points of curves are PointSet over mapped blocks
+    """
+    with open(filename, 'rb') as infile:
+        if infile.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{} is not binary project'.format(filename))
+        length, = struct.unpack('<Q', infile.read(8))
+        header = json.loads(infile.read(length).decode('utf-8'))
+        offset = infile.tell()
+        total = sum(c['points'][1] for c in header['curves']) * 3
+
+        if not total:
+            blocks = np.zeros(0, dtype=DTYPE)
+        elif mmap:
+            blocks = np.memmap(
+                filename, dtype=DTYPE, mode='c', offset=offset,
+                shape=(total,)
+            )
+        else:
+            blocks = np.fromfile(infile, dtype=DTYPE, count=total)
+
+    curves = []
+    for curve in header['curves']:
+        start, count = curve['points']
+        block = blocks[start:start + 3 * count].reshape(count, 3)
+        data = dict(curve['data'])
+        data['points'] = PointSet.from_buffer(block)
+        if curve.get('bounds') is not None:
+            data['bounds'] = tuple(curve['bounds'])
+        curves.append({'data': data, 'type': curve['type']})
+
+    return dict(header, curves=curves)
+
+
+def write(filename, project):
+    """
+    Write binary project.
+    """
+    curves = []
+    blocks = []
+    start = 0
+    for curve in project.get('curves'):
+        data = dict(curve.get('data'))
+        points = _points_array(data.pop('points', ()))
+        data.pop('bounds', None)
+
+        bounds = None
+        if len(points):
+            bounds = (
+                points[:, :2].min(axis=0).tolist() +
+                points[:, :2].max(axis=0).tolist()
+            )
+        curves.append({
+            'data': data,
+            'type': curve.get('type'),
+            'points': (start, len(points)),
+            'bounds': bounds
+        })
+        blocks.append(points)
+        start += 3 * len(points)
+
+    header = json.dumps(dict(project, curves=curves))
+    header = header.encode('utf-8')
+    padding = -(len(MAGIC) + 8 + len(header)) % ALIGNMENT
+    header += b' ' * padding
+
+    with open(filename, 'wb') as outfile:
+        outfile.write(MAGIC)
+        outfile.write(struct.pack('<Q', len(header)))
+        outfile.write(header)
+        for block in blocks:
+            outfile.write(block.astype(DTYPE).tobytes())
+
+
+def _points_array(points):
+    """
+    Get points as array of rows (x, y, weight).
+    """
+    if not isinstance(points, PointSet):
+        points = PointSet(points)
+    return np.ascontiguousarray(points.array)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Closest point on curve.
+
+Segment of sampled polyline nearest to given position is found in
+hierarchy of bounding boxes, then parameter is refined with Newton
+iteration on exact curve.
+"""
+
+import numpy as np
+
+MAX_ITERATIONS = 8
+TOLERANCE = 1e-12  # step of Newton iteration relative to domain
+
+
+class SegmentTree(object):
+    """
+    Hierarchy of bounding boxes over segments of polyline. Level 0 holds
+    boxes of segments, box of every next level covers two boxes below.
+    """
+
+    def __init__(self, t, points):
+        """
+        :param t: parameters of polyline points
+        :param points: polyline points of shape (len(t), 2)
+        """
+        self.t = np.asarray(t, dtype=float)
+        self.points = np.asarray(points, dtype=float)
+
+        lower = np.minimum(self.points[:-1], self.points[1:])
+        upper = np.maximum(self.points[:-1], self.points[1:])
+        self.levels = [(lower, upper)]
+        while len(lower) > 1:
+            if len(lower) % 2:
+                lower = np.vstack((lower, [(np.inf, np.inf)]))
+                upper = np.vstack((upper, [(-np.inf, -np.inf)]))
+            lower = np.minimum(lower[0::2], lower[1::2])
+            upper = np.maximum(upper[0::2], upper[1::2])
+            self.levels.append((lower, upper))
+
+    def __len__(self):
+        return len(self.levels[0][0])
+
+    def box_distance(self, level, i, position, scale):
+        lower, upper = self.levels[level]
+        if i >= len(lower):
+            return np.inf
+        d = np.maximum(np.maximum(lower[i] - position, position - upper[i]), 0)
+        return np.hypot(*(d * scale))
+
+    def segment_distance(self, i, position, scale):
+        """
+        :return: distance, position of nearest point on segment in [0, 1]
+        """
+        a = self.points[i] * scale
+        b = self.points[i + 1] * scale
+        q = position * scale
+        ab = b - a
+        length = ab.dot(ab)
+        u = 0.0 if length == 0 else min(max((q - a).dot(ab) / length, 0), 1)
+        return np.hypot(*(a + u * ab - q)), u
+
+    def nearest(self, position, scale=(1, 1)):
+        """
+        Find point of polyline nearest to position, nodes farther than
+        best segment found so far are skipped.
+        :param position: x, y
+        :param scale: units of x and y used in distance, e.g. pixels
+        :return: t, distance
+        """
+        position = np.asarray(position, dtype=float)
+        scale = np.asarray(scale, dtype=float)
+        best_distance, best_t = np.inf, None
+
+        stack = [(len(self.levels) - 1, 0)]
+        while stack:
+            level, i = stack.pop()
+            if self.box_distance(level, i, position, scale) >= best_distance:
+                continue
+
+            if level == 0:
+                distance, u = self.segment_distance(i, position, scale)
+                if distance < best_distance:
+                    best_distance = distance
+                    best_t = self.t[i] + u * (self.t[i + 1] - self.t[i])
+                continue
+
+            children = [(level - 1, 2 * i), (level - 1, 2 * i + 1)]
+            children.sort(
+                key=lambda c: -self.box_distance(c[0], c[1], position, scale)
+            )
+            stack.extend(children)
+
+        return best_t, best_distance
+
+
+def closest_point(model, tree, position, scale=(1, 1)):
+    """
+    Find point of curve nearest to position.
+    :param model: curve model
+    :param tree: SegmentTree of sampled curve
+    :param position: x, y
+    :param scale: units of x and y used in distance, e.g. pixels
+    :return: t, point, distance
+    """
+    position = np.asarray(position, dtype=float)
+    weights = np.asarray(scale, dtype=float) ** 2
+    t_min, t_max = model.domain()[:2]
+    start, _ = tree.nearest(position, scale)
+
+    t = start
+    for _ in range(MAX_ITERATIONS):
+        points, first, second = model.derivatives([t], cache=False)
+        difference = (points[0] - position) * weights
+        gradient = difference.dot(first[0])
+        hessian = (
+            (first[0] * weights).dot(first[0]) + difference.dot(second[0])
+        )
+        if not hessian > 0:
+            break
+
+        step = gradient / hessian
+        t = min(max(t - step, t_min), t_max)
+        if abs(step) <= TOLERANCE * (t_max - t_min):
+            break
+
+    candidates = np.array([start, t])
+    points = model.evaluate(candidates, cache=False)
+    distances = np.hypot(*((points - position) * scale).T)
+    best = 1 if distances[1] <= distances[0] else 0
+    return candidates[best], points[best], distances[best]
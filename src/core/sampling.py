@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+TOLERANCE = 0.5  # maximal distance from curve in pixels
+INITIAL = 33
+MAX_INITIAL = 4097  # maximal number of samples before refinement
+MAX_DEPTH = 12
+
+
+def fit_transforms(points, owner, count, width, height):
+    """
+    Build transform mapping bounding box of points of every curve onto
+    screen area. Used when axes limits are not known yet (autoscale).
+    :param points: array of shape (n, 2)
+    :param owner: index of curve of every point
+    :param count: number of curves
+    :param width: width of screen area in pixels
+    :param height: height of screen area in pixels
+    :return: transform of points and their owners :type callable
+    """
+    points = np.asarray(points, dtype=float)
+    finite = np.isfinite(points).all(axis=1)
+    low = np.full((count, 2), np.inf)
+    high = np.full((count, 2), -np.inf)
+    np.minimum.at(low, owner[finite], points[finite])
+    np.maximum.at(high, owner[finite], points[finite])
+
+    # curves without finite points are not transformed
+    empty = ~np.isfinite(low).all(axis=1)
+    low[empty] = 0
+    size = high - low
+    size[empty] = 1
+    size[size == 0] = 1
+    scale = np.array([width, height], dtype=float) / size
+    scale[empty] = 1
+
+    return lambda p, o: (np.asarray(p) - low[o]) * scale[o]
+
+
+def distance_to_segment(points, start, end):
+    """
+    Calculate distances of points to segments start-end.
+    All arguments are arrays of shape (n, 2).
+    """
+    direction = end - start
+    length = (direction ** 2).sum(axis=1)
+    length[length == 0] = 1
+    u = ((points - start) * direction).sum(axis=1) / length
+    u = np.clip(u, 0, 1).reshape(-1, 1)
+    return np.sqrt(((start + u * direction - points) ** 2).sum(axis=1))
+
+
+def adaptive(function, t_min, t_max, transform=None, size=(800, 600),
+             tolerance=TOLERANCE, step=0, initial=INITIAL,
+             max_depth=MAX_DEPTH):
+    """
+    Sample curve with density depending on its flatness on screen.
+    Segment is split while its midpoint lies further than tolerance
+    pixels from the chord.
+    :param function: curve, maps array of t to array of shape (n, 2),
+        refined parameters are used once and passed with cache=False
+    :param t_min: start of parameter range
+    :param t_max: end of parameter range
+    :param transform: maps data points to pixels, fitted to the curve
+        bounding box of given size when None
+    :param tolerance: maximal deviation in pixels
+    :param step: maximal difference between parameters before
+        refinement, e.g. step of range given by user
+    :return: t, points :type array, array of shape (n, 2)
+    """
+    return adaptive_many(
+        lambda t, owner: function(t, cache=False),
+        [(t_min, t_max, step)], transform, size, tolerance, initial,
+        max_depth, grid=lambda t: [function(t)]
+    )[0]
+
+
+def adaptive_many(function, domains, transform=None, size=(800, 600),
+                  tolerance=TOLERANCE, initial=INITIAL, max_depth=MAX_DEPTH,
+                  grid=None):
+    """
+    Sample many curves at once, the same way as adaptive. Samples of all
+    curves are kept in one array, so every level of refinement evaluates
+    all curves with one call of function.
+    :param function: maps array of t and array of curve indexes
+        to array of shape (n, 2)
+    :param domains: t_min, t_max, step of every curve, first level
+        has at least initial and at most MAX_INITIAL samples
+    :param transform: maps data points to pixels, fitted to bounding box
+        of every curve when None
+    :param grid: maps array of t to array of shape (curves, len(t), 2),
+        used for first level when all curves have the same range
+    :return: t, points of every curve :type list
+    """
+    domains = np.array(domains, dtype=float).reshape(-1, 3)
+    count = len(domains)
+    if not count:
+        return []
+
+    t_min, t_max, step = domains.T
+    counts = np.full(count, initial, dtype=int)
+    stepped = step > 0
+    counts[stepped] = np.ceil(
+        abs(t_max - t_min)[stepped] / step[stepped]
+    ) + 1
+    counts = np.clip(counts, initial, MAX_INITIAL)
+
+    owner = np.repeat(np.arange(count), counts)
+    starts = np.cumsum(counts) - counts
+    u = (np.arange(len(owner)) - starts[owner]) / (counts[owner] - 1.0)
+    t = t_min[owner] + u * (t_max - t_min)[owner]
+    if grid is not None and (
+        (counts == counts[0]).all() and
+        (domains[:, :2] == domains[0, :2]).all()
+    ):
+        points = np.asarray(grid(t[:counts[0]]), dtype=float).reshape(-1, 2)
+    else:
+        points = np.asarray(function(t, owner), dtype=float)
+
+    if transform is None:
+        transform = fit_transforms(points, owner, count, *size)
+    else:
+        to_pixels = transform
+        transform = lambda p, o: to_pixels(p)
+    screen = transform(points, owner)
+
+    pending = np.nonzero(owner[:-1] == owner[1:])[0]
+    for _ in range(max_depth):
+        if not len(pending):
+            break
+
+        mid_t = (t[pending] + t[pending + 1]) / 2
+        mid_owner = owner[pending]
+        mid = np.asarray(function(mid_t, mid_owner), dtype=float)
+        mid_screen = transform(mid, mid_owner)
+
+        deviation = distance_to_segment(
+            mid_screen, screen[pending], screen[pending + 1]
+        )
+        split = deviation > tolerance
+
+        index = pending[split] + 1
+        t = np.insert(t, index, mid_t[split])
+        points = np.insert(points, index, mid[split], axis=0)
+        screen = np.insert(screen, index, mid_screen[split], axis=0)
+        owner = np.insert(owner, index, mid_owner[split])
+
+        # both halves of every split segment are checked again
+        inserted = index + np.arange(len(index))
+        pending = np.column_stack((inserted - 1, inserted)).ravel()
+
+    bounds = np.searchsorted(owner, np.arange(1, count))
+    return list(zip(np.split(t, bounds), np.split(points, bounds)))
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Spatial index of control points.
+
+Points are assigned to cells of uniform grid and sorted by cell, so points
+of one cell are found by binary search. Changed points are kept aside and
+checked directly until index is rebuilt.
+"""
+
+import numpy as np
+
+KEY_SHIFT = 2 ** 32
+
+
+class GridIndex(object):
+    """
+    Index of points answering queries for points near given position.
+    """
+
+    def __init__(self, points=()):
+        """
+        :param points: array of shape (n, 2)
+        """
+        self.build(points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def build(self, points):
+        """
+        Sort points by cells in O(n log n). Cell size is chosen so there is
+        about one point per cell.
+        """
+        self.points = np.array(points, dtype=float).reshape(-1, 2)
+        self.dirty = set()
+        n = len(self.points)
+
+        self.cell = 1.0
+        if n > 1:
+            extent = np.ptp(self.points, axis=0).max()
+            if extent > 0:
+                self.cell = extent / np.sqrt(n)
+
+        keys = self.keys(self.points)
+        self.order = np.argsort(keys, kind='mergesort')
+        self.sorted_keys = keys[self.order]
+
+    def keys(self, points):
+        cells = np.floor(points / self.cell).astype(np.int64)
+        return cells[:, 0] * KEY_SHIFT + cells[:, 1]
+
+    def insert(self, index, point):
+        self.order[self.order >= index] += 1
+        self.points = np.insert(self.points, index, point[:2], axis=0)
+        self.dirty = set(i + 1 if i >= index else i for i in self.dirty)
+        self.dirty.add(index)
+        self.__check_dirty()
+
+    def move(self, index, point):
+        self.points[index] = point[:2]
+        self.dirty.add(index)
+        self.__check_dirty()
+
+    def remove(self, index):
+        position = np.nonzero(self.order == index)[0]
+        self.order = np.delete(self.order, position)
+        self.sorted_keys = np.delete(self.sorted_keys, position)
+        self.order[self.order > index] -= 1
+        self.points = np.delete(self.points, index, axis=0)
+        self.dirty = set(
+            i - 1 if i > index else i for i in self.dirty if i != index
+        )
+
+    def __check_dirty(self):
+        """
+        Rebuild index when too many points are kept aside.
+        """
+        if len(self.dirty) > 16 + np.sqrt(len(self.points)):
+            self.build(self.points)
+
+    def candidates(self, x, y, rx, ry):
+        """
+        Get indexes of points which may lie in box around position.
+        :param x, y: position
+        :param rx, ry: half of box width and height
+        :return: indexes :type array
+        """
+        x_min, x_max = np.floor(np.array((x - rx, x + rx)) / self.cell)
+        y_min, y_max = np.floor(np.array((y - ry, y + ry)) / self.cell)
+        cells = (x_max - x_min + 1) * (y_max - y_min + 1)
+        if cells > len(self.points):
+            return np.arange(len(self.points))
+
+        found = [np.array(sorted(self.dirty), dtype=int)]
+        ys = np.arange(y_min, y_max + 1, dtype=np.int64)
+        for cx in np.arange(x_min, x_max + 1, dtype=np.int64):
+            keys = cx * KEY_SHIFT + ys
+            start = np.searchsorted(self.sorted_keys, keys, side='left')
+            end = np.searchsorted(self.sorted_keys, keys, side='right')
+            for s, e in zip(start, end):
+                if e > s:
+                    found.append(self.order[s:e])
+        return np.unique(np.concatenate(found))
+
+    def nearest(self, x, y, rx, ry):
+        """
+        Find point nearest to position inside ellipse with given radii.
+        For linear axes radii of ellipse are radius of circle in display
+        coordinates expressed in data units, so distance is measured as
+        on screen.
+        :param x, y: position
+        :param rx, ry: radii
+        :return: index, distance relative to radius or None
+        """
+        if not len(self.points) or rx <= 0 or ry <= 0:
+            return None
+
+        indexes = self.candidates(x, y, rx, ry)
+        if not len(indexes):
+            return None
+
+        points = self.points[indexes]
+        distances = np.hypot((points[:, 0] - x) / rx, (points[:, 1] - y) / ry)
+        best = np.argmin(distances)
+        if distances[best] > 1:
+            return None
+        return int(indexes[best]), float(distances[best])
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluation of many curves at once.
+
+Polynomial and rational Bezier curves of equal degree are stacked into one
+array of control points of shape (curves, points, dims) and evaluated with
+one einsum against Bernstein basis. Other curves are evaluated one by one.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+import evaluation
+import sampling
+from models import BezierModel, RationalBezierModel
+
+
+def is_stackable(model):
+    return isinstance(model, BezierModel) and len(model.points) > 0
+
+
+class CurveStack(object):
+    """
+    Curve models grouped by type and degree.
+    """
+
+    def __init__(self, models):
+        """
+        :param models: list of curve models
+        """
+        self.models = list(models)
+        self.errors = {}
+        self.single = []
+        self.groups = []
+        self.group_of = np.full(len(self.models), -1, dtype=int)
+        self.position = np.zeros(len(self.models), dtype=int)
+
+        groups = OrderedDict()
+        for i, model in enumerate(self.models):
+            if is_stackable(model):
+                key = len(model.points) - 1, isinstance(
+                    model, RationalBezierModel
+                )
+                groups.setdefault(key, []).append(i)
+            else:
+                self.single.append(i)
+
+        for (degree, rational), indexes in groups.items():
+            if rational:
+                points = [self.models[i].homogeneous_points for i in indexes]
+            else:
+                points = [self.models[i].points.array[:, :2] for i in indexes]
+            self.group_of[indexes] = len(self.groups)
+            self.position[indexes] = np.arange(len(indexes))
+            self.groups.append(
+                (np.array(indexes), degree, np.array(points), rational)
+            )
+
+    def __len__(self):
+        return len(self.models)
+
+    def evaluate(self, t):
+        """
+        Evaluate all curves for the same parameters.
+        :param t: array of parameters
+        :return: points :type array of shape (curves, len(t), 2)
+        """
+        result = np.empty((len(self.models), len(t), 2))
+        for indexes, degree, points, rational in self.groups:
+            values = np.einsum(
+                'ti,cid->ctd', evaluation.bernstein_matrix(degree, t), points
+            )
+            result[indexes] = self.project(values, rational)
+
+        for i in self.single:
+            result[i] = self.evaluate_single(i, t)
+        return result
+
+    def evaluate_rows(self, t, owner):
+        """
+        Evaluate every parameter on its own curve.
+        :param t: array of parameters
+        :param owner: index of curve of every parameter
+        :return: points :type array of shape (len(t), 2)
+        """
+        t = np.asarray(t, dtype=float)
+        result = np.empty((len(t), 2))
+        group_of = self.group_of[owner]
+        for g, (_, degree, points, rational) in enumerate(self.groups):
+            rows = np.nonzero(group_of == g)[0]
+            if not len(rows):
+                continue
+            basis = evaluation.bernstein_matrix(degree, t[rows], cache=False)
+            values = np.einsum(
+                'ti,tid->td', basis, points[self.position[owner[rows]]]
+            )
+            result[rows] = self.project(values, rational)
+
+        for i in self.single:
+            rows = np.nonzero(owner == i)[0]
+            if len(rows):
+                result[rows] = self.evaluate_single(i, t[rows], False)
+        return result
+
+    @staticmethod
+    def project(values, rational):
+        if rational:
+            return values[..., :2] / values[..., 2:]
+        return values
+
+    def evaluate_single(self, i, t, cache=True):
+        """
+        Evaluate curve which is not stacked, curve raising error
+        is remembered and gives nan.
+        """
+        if i not in self.errors:
+            try:
+                return self.models[i].evaluate(t, cache)
+            except Exception as e:
+                self.errors[i] = e
+        return np.full((len(t), 2), np.nan)
+
+    def sample(self, transform=None, size=(800, 600), domains=None):
+        """
+        Sample all curves adaptively at once.
+        :param transform: maps data points to pixels, fitted to every
+            curve when None
+        :param domains: t_min, t_max, step of every curve,
+            whole curves when None
+        :return: t, points of every curve or None for curve which
+            couldn't be evaluated :type list
+        """
+        if domains is None:
+            domains = []
+            for i, model in enumerate(self.models):
+                try:
+                    domains.append(model.domain())
+                except Exception as e:
+                    self.errors[i] = e
+                    domains.append((0, 1, 0))
+
+        samples = sampling.adaptive_many(
+            self.evaluate_rows, domains, transform, size, grid=self.evaluate
+        )
+        return [
+            None if i in self.errors else s for i, s in enumerate(samples)
+        ]
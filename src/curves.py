@@ -1,41 +1,55 @@
 # -*- coding: utf-8 -*-
-import copy
-from math import floor
 import numpy as np
 
-import utils
 import dialogs
-from point import Point
+from core import history, incremental, models, projection, sampling
+from core.cache import LRUCache
+from core.point import Point
 
 
 class Curve(object):
+    """
+    Curve drawn on figure, adapter over curve model.
+    """
     type = None
+    model_class = None
     dialog_class = None
     options_class = None
 
     def __init__(self, ui):
         self.ui = ui
-        self.name = None
+        self.model = self.model_class()
         self.line = None
         self.help_line = None
         self.data = {}
-        self.points = []
-        self.translation = [0, 0]
         self.rotation = 0
-
-    def create(self, data):
+        self.t_list = np.array([])
+        self.outline = None
+        self.segments = None
+        self.lod_cache = LRUCache(maxsize=4)
+        self.materialized = False
+        self.incremental = None
+
+    def create(self, data, samples=None, lazy=False):
         """
         Create curve.
         :param data:
+        :param samples: samples of whole curve computed by model
+        :param lazy: create empty line, curve is evaluated by materialize
         :return: created :type boolean
         """
-        self.name = data.get('name')
         self.data = data
+        self.model.set_data(data)
         fig = self.ui.figure
         ax = fig.add_subplot(111)
 
         try:
-            x, y = self.get_plot_functions()
+            if lazy:
+                x, y = [], []
+            elif samples is None:
+                x, y = self.get_plot_functions()
+            else:
+                x, y = self.set_samples(samples)
             self.line, = ax.plot(x, y, label=self.name)
             return True
         except:
@@ -50,12 +64,17 @@ class Curve(object):
 
         if is_valid:
             if data != self.data:
+                name = self.name
                 if self.name != data.get('name'):
                     item = self.ui.get_curve_item()
                     self.name = data.get('name')
                     item.setText(self.name)
 
                 self.data = data
+                self.model.set_data(data)
+                self.ui.journal.record(
+                    'set_data', name, data=self.model.settings()
+                )
                 self.update()
                 return True
             return False
@@ -75,27 +94,231 @@ class Curve(object):
         is_valid, data = self.draw_curve_dialog(True)
 
         curve_data['name'] = data.get('name')
-        curve_data['points'] = copy.deepcopy(self.points)
+        curve_data['points'] = self.points.share()
 
         return is_valid, curve_data
 
     def delete(self):
         self.line.remove()
         self.help_line.remove()
-        self.ui.canvas.draw()
+        self.ui.scheduler.request()
 
     def load(self, data):
-        return data
+        return self.model_class.load(data)
+
+    def save(self, shared=False):
+        return self.model.to_dict(shared)
+
+    def record(self, action, **params):
+        """
+        Append change of curve to journal of editor.
+        """
+        self.ui.journal.record(action, self.name, **params)
 
-    def save(self):
-        return {}
+    def materialize(self, samples=None):
+        """
+        Evaluate curve created as lazy.
+        :param samples: samples of whole curve computed by model
+        :return: evaluated now :type boolean
+        """
+        if self.materialized:
+            return False
+
+        if samples is None:
+            self.line.set_data(self.get_plot_functions())
+        else:
+            self.line.set_data(self.set_samples(samples))
+        return True
+
+    def bounds(self):
+        """
+        Get bounding box of curve, estimated from control points
+        until curve is evaluated.
+        :return: x_min, y_min, x_max, y_max or None when unknown
+        """
+        if self.outline is not None and len(self.outline[0]):
+            points = self.outline[1]
+            return tuple(points.min(axis=0)) + tuple(points.max(axis=0))
+        if not self.materialized and 'bounds' in self.data:
+            return self.data['bounds']
+        return self.model.bounds()
 
     def get_plot_functions(self):
         """
         Get lists of points.
         :return: xp, yp :type list, list
         """
-        pass
+        self.materialized = True
+        self.outline = None
+        self.segments = None
+        self.incremental = None
+        xs, ys = [], []
+
+        if self.model.is_drawable():
+            self.t_list, points = self.sample_curve()
+            xs, ys = points.T
+        return xs, ys
+
+    def evaluate(self, t, cache=True):
+        """
+        Evaluate curve for array of parameters.
+        :param t: array of parameters
+        :param cache: parameters may be used again
+        :return: points :type array of shape (len(t), 2)
+        """
+        return self.model.evaluate(t, cache)
+
+    def domain(self):
+        """
+        Get parameter range of whole curve.
+        :return: t_min, t_max, step of initial samples or 0
+        """
+        return self.model.domain()
+
+    def sample(self, t_min, t_max, step=0, overview=False):
+        """
+        Sample curve with density matched to current zoom.
+        :param t_min: start of parameter range
+        :param t_max: end of parameter range
+        :param step: maximal difference between parameters before
+            refinement
+        :param overview: sample as if whole curve filled the axes
+        :return: t, points :type array, array of shape (n, 2)
+        """
+        ax = self.ui.figure.add_subplot(111)
+        transform = None
+        if not (overview or ax.get_autoscale_on()):
+            transform = ax.transData.transform
+
+        return sampling.adaptive(
+            self.evaluate, t_min, t_max, transform,
+            size=(ax.bbox.width, ax.bbox.height), step=step
+        )
+
+    def sample_curve(self):
+        """
+        Sample whole curve and get part visible in current view.
+        :return: t, points :type array, array of shape (n, 2)
+        """
+        self.lod_cache.clear()
+        self.outline = self.sample(*self.domain(), overview=True)
+        return self.sample_view()
+
+    def set_samples(self, samples):
+        """
+        Use samples of whole curve computed elsewhere.
+        :param samples: t, points
+        :return: xp, yp :type list, list
+        """
+        self.materialized = True
+        self.lod_cache.clear()
+        self.outline = None
+        self.segments = None
+        self.incremental = None
+        xs, ys = [], []
+
+        if len(samples[0]):
+            self.outline = samples
+            self.t_list, points = self.sample_view()
+            xs, ys = points.T
+        return xs, ys
+
+    def sample_view(self):
+        """
+        Get samples of visible part of curve, with density matched
+        to current view. Last few views are cached.
+        :return: t, points :type array, array of shape (n, 2)
+        """
+        ax = self.ui.figure.add_subplot(111)
+        if ax.get_autoscale_on():
+            return self.outline
+
+        key = self.view_key(ax)
+        samples = self.lod_cache.get(key)
+        if samples is None:
+            domain = self.visible_domain(ax)
+            if domain is None:
+                samples = np.array([]), np.zeros((0, 2))
+            else:
+                samples = self.sample(*domain)
+            self.lod_cache.set(key, samples)
+        return samples
+
+    @staticmethod
+    def view_key(ax):
+        return (
+            tuple(ax.get_xlim()), tuple(ax.get_ylim()),
+            ax.bbox.width, ax.bbox.height
+        )
+
+    def missing_view(self, ax):
+        """
+        Get parameter range of visible part of curve when its samples
+        for current view are not cached yet.
+        :return: t_min, t_max, step or None
+        """
+        if self.line is None or self.outline is None:
+            return None
+        if ax.get_autoscale_on() or self.view_key(ax) in self.lod_cache.data:
+            return None
+        return self.visible_domain(ax)
+
+    def add_view(self, ax, samples):
+        """
+        Keep samples of current view computed elsewhere.
+        :param samples: t, points
+        """
+        self.lod_cache.set(self.view_key(ax), samples)
+
+    def visible_domain(self, ax):
+        """
+        Get parameter range of curve part inside axes limits.
+        :return: t_min, t_max, step or None when curve is not visible
+        """
+        x_min, x_max = sorted(ax.get_xlim())
+        y_min, y_max = sorted(ax.get_ylim())
+        t, points = self.outline
+        start, end = points[:-1], points[1:]
+
+        with np.errstate(invalid='ignore'):
+            visible = (
+                (np.minimum(start[:, 0], end[:, 0]) <= x_max) &
+                (np.maximum(start[:, 0], end[:, 0]) >= x_min) &
+                (np.minimum(start[:, 1], end[:, 1]) <= y_max) &
+                (np.maximum(start[:, 1], end[:, 1]) >= y_min)
+            )
+        index = np.nonzero(visible)[0]
+        if not len(index):
+            return None
+
+        step = self.domain()[2]
+        return t[index[0]], t[index[-1] + 1], step
+
+    def closest_point(self, x, y, scale=(1, 1)):
+        """
+        Find point of curve nearest to position.
+        :param x, y: position
+        :param scale: units of x and y used in distance, e.g. pixels
+        :return: t, point, distance or None when curve isn't drawn
+        """
+        if self.outline is None or len(self.outline[0]) < 2:
+            return None
+
+        if self.segments is None:
+            self.segments = projection.SegmentTree(*self.outline)
+        return projection.closest_point(
+            self.model, self.segments, (x, y), scale
+        )
+
+    def resample_view(self):
+        """
+        Update line with samples matched to current view.
+        """
+        if self.line is None or self.outline is None:
+            return
+
+        self.t_list, points = self.sample_view()
+        self.line.set_data(points.T)
 
     def translate(self):
         """
@@ -106,11 +329,11 @@ class Curve(object):
         if dialog.exec_():
             data = dialog.get_data()
 
-            self.translation[0] += data.get('x')
-            self.translation[1] += data.get('y')
-
-            for p in self.points:
-                p.update(data.get('x'), data.get('y'))
+            self.model.translate(data.get('x'), data.get('y'))
+            self.record('translate', x=data.get('x'), y=data.get('y'))
+            self.ui.history.push(
+                history.Translate(self.model, data.get('x'), data.get('y'))
+            )
 
             self.line.set_data(self.get_plot_functions())
             self.ui.update_plot()
@@ -148,79 +371,151 @@ class Curve(object):
         if event.inaxes != self.help_line.axes:
             return
 
-        point = Point(event.xdata, event.ydata)
-
-        if index is not None:
-            self.points.insert(index, point)
-        else:
-            self.points.append(point)
+        index = self.model.insert_point(index, Point(event.xdata, event.ydata))
+        index, point = int(index), self.points[index].save()
+        self.record('insert_point', index=index, point=point)
+        self.ui.history.push(history.InsertPoint(self.model, index, point))
         self.line.set_data(self.get_plot_functions())
 
-    def edit_point(self, data, index):
-        if data.get('x'):
-            self.points[index].x = data.get('x')
-        if data.get('y'):
-            self.points[index].y = data.get('y')
+    def edit_point(self, data, index, merge=False):
+        self.edit_points({index: data}, merge)
+
+    def edit_points(self, changes, merge=False):
+        """
+        Change many points with one curve update.
+        :param changes: dict {index: {'x': x, 'y': y}}
+        :param merge: join change with previous one in history
+        """
+        commands = []
+        for index, data in changes.items():
+            old = self.get_point_data(index)
+            self.model.set_point(index, data)
+            new = self.get_point_data(index)
+            self.record('set_point', index=int(index), data=new)
+            commands.append(
+                history.SetPoint(self.model, int(index), old, new)
+            )
+
+        if len(commands) == 1:
+            self.ui.history.push(commands[0], merge)
+            command = commands[0]
+            if merge and self.move_samples(
+                command.index, command.old, command.new
+            ):
+                return
+        elif commands:
+            self.ui.history.push(history.Group(self.model, commands))
         self.line.set_data(self.get_plot_functions())
 
+    def move_samples(self, index, old, new):
+        """
+        Update samples after point was dragged without sampling
+        curve again.
+        :param old: dict with x, y and w before move
+        :param new: dict with x, y and w after move
+        :return: samples were updated :type boolean
+        """
+        return False
+
+    def finish_edit(self):
+        """
+        Sample curve again when its samples were updated by dragging.
+        """
+        if self.incremental is not None:
+            self.line.set_data(self.get_plot_functions())
+
+    def get_point_data(self, index):
+        return dict(zip(('x', 'y', 'w'), self.points[index].save()))
+
     def remove_point(self, index):
-        del self.points[index]
+        index, point = int(index), self.points[index].save()
+        self.model.remove_point(index)
+        self.record('remove_point', index=index)
+        self.ui.history.push(history.RemovePoint(self.model, index, point))
+        self.line.set_data(self.get_plot_functions())
+
+    def memory(self):
+        """
+        Get memory used by curve.
+        :return: dict with owned, shared and mapped bytes of points
+            and bytes of samples
+        """
+        report = self.points.memory()
+        samples = list(self.lod_cache.data.values())
+        if self.outline is not None:
+            samples.append(self.outline)
+        report['samples'] = sum(t.nbytes + p.nbytes for t, p in samples)
+        return report
+
+    def apply(self, changes):
+        """
+        Apply changes from history to model.
+        :param changes: list of (action, params)
+        """
+        for action, params in changes:
+            getattr(self.model, action)(**params)
+            self.record(action, **params)
         self.line.set_data(self.get_plot_functions())
 
+    @property
+    def name(self):
+        return self.model.name
+
+    @name.setter
+    def name(self, name):
+        self.model.name = name
+
+    @property
+    def points(self):
+        return self.model.points
+
+    @points.setter
+    def points(self, points):
+        self.model.points = points
+
     @property
     def xp(self):
-        return list(p.x for p in self.points)
+        return self.points.xs
 
     @property
     def yp(self):
-        return list(p.y for p in self.points)
+        return self.points.ys
 
     @property
     def points_2D(self):
-        return list(map(lambda p: p.cord, self.points))
+        return self.points.array[:, :2]
 
 
 class CurveWithHelpLine(Curve):
-    def __init__(self, ui, num=200):
-        super(CurveWithHelpLine, self).__init__(ui)
-        self.t_list = np.linspace(0, 1, num=num)
-
-    def create(self, data):
+    def create(self, data, samples=None, lazy=False):
         fig = self.ui.figure
         ax = fig.add_subplot(111)
         self.points = data.get('points', [])
+        xs, ys = ([], []) if lazy else (self.xp, self.yp)
         self.help_line, = ax.plot(
-            self.xp, self.yp, ls='--', c='#666666', marker='x', mew=2,
-            mec='#204a87', picker=5, label=data.get('name') + ' help line'
+            xs, ys, ls='--', c='#666666', marker='x', mew=2,
+            mec='#204a87', label=data.get('name') + ' help line'
         )
-        created = super(CurveWithHelpLine, self).create(data)
+        created = super(CurveWithHelpLine, self).create(data, samples, lazy)
 
         return created
 
-    def save(self):
-        return {
-            'data': {
-                'points': [p.save() for p in self.points],
-                'name': self.name
-            },
-            'type': self.type
-        }
+    def get_plot_functions(self):
+        self.help_line.set_data(self.xp, self.yp)
+        return super(CurveWithHelpLine, self).get_plot_functions()
 
-    @staticmethod
-    def load(data):
-        points = [Point(*p) for p in data.get('points')]
-        return {
-            'name': data.get('name'),
-            'points': points
-        }
+    def set_samples(self, samples):
+        self.help_line.set_data(self.xp, self.yp)
+        return super(CurveWithHelpLine, self).set_samples(samples)
 
 
 class ParametricCurve(Curve):
     type = 'PARAM'
+    model_class = models.ParametricModel
     dialog_class = dialogs.ParamDialog
 
-    def create(self, data):
-        created = super(ParametricCurve, self).create(data)
+    def create(self, data, samples=None, lazy=False):
+        created = super(ParametricCurve, self).create(data, samples, lazy)
         if created:
             self.help_line = self.line
 
@@ -233,97 +528,45 @@ class ParametricCurve(Curve):
 
         return edited
 
-    def save(self):
-        return {
-            'data': self.data,
-            'type': self.type
-        }
-
-    def get_plot_functions(self):
-        range_t = utils.parse_range(self.data.get('range'))
-
-        t_min = range_t.get('min')
-        t_max = range_t.get('max')
-        t_interval = range_t.get('interval')
-
-        function_x = utils.parse_curve_function(self.data.get('function_x'))
-        function_y = utils.parse_curve_function(self.data.get('function_y'))
-
-        xs = []
-        ys = []
-        for i in np.arange(t_min, t_max, t_interval):
-            # this t is need for parametric curves
-            t = float(i)
-            x = eval(function_x) + self.translation[0]
-            y = eval(function_y) + self.translation[1]
-
-            xs.append(x)
-            ys.append(y)
-
-        return xs, ys
-
 
 class NewtonCurve(CurveWithHelpLine):
     type = 'NEWTON'
+    model_class = models.NewtonModel
     dialog_class = dialogs.CurveNameDialog
     options_class = dialogs.NewtonOptionsDialog
 
-    def get_plot_functions(self, num=200):
-        self.help_line.set_data(self.xp, self.yp)
-
-        xs, ys = [], []
+    @property
+    def mode(self):
+        return self.model.mode
 
-        if len(self.points) >= 2:
-            xs = np.linspace(self.xp[0], self.xp[-1], num)
-            ys = [self.newton(self.coef(), x) for x in xs]
+    def set_mode(self, mode):
+        """
+        Change interpolation mode.
+        :param mode: 'newton' or 'barycentric'
+        """
+        if mode == self.model.mode:
+            return
 
-        return xs, ys
+        command = history.SetMode(self.model, self.model.mode, mode)
+        self.model.set_mode(mode)
+        self.ui.history.push(command)
+        self.record('set_mode', mode=mode)
+        self.update()
 
     def coef(self):
         """
         Calculate coefficients
         :return: an array of coefficient
         """
-        n = len(self.xp)
-        b = np.array(self.yp)
-
-        for i in range(1, n):
-            for k in range(n-1, i-1, -1):
-                b[k] = (b[k] - b[k-1])/(self.xp[k] - self.xp[k-i])
-
-        return b
-
-    def newton(self, b, x):
-        """
-        Calculate newton polynomial
-        :param b: array returned by function coef()
-        :param x: the node to interpolate at
-        :return: the y_value interpolation
-        """
-        n = len(b) - 1
-        temp = b[n]
-        for k in range(n - 1, -1, -1):
-            temp = temp * (x - self.xp[k]) + b[k]
-        return temp
+        return self.model.coefficients()
 
     def transform_to_bezier(self):
-        n = len(self.xp) - 1
-        if n < 1:
-            return []
-
-        b = self.coef()
-        c = np.zeros(n+1)
-        c[n] = b[n]
-
-        for k in range(n-1, -1, -1):
-            t = 1 - self.xp[k]
-            for i in range(k, n):
-                c[i] = (t * (i-k) * c[i] - self.xp[k] * (n-i) * c[i+1]) / (n-k) + b[k]
-        return list(c)
+        return self.model.to_bezier()
 
 
 class BezierCurve(CurveWithHelpLine):
     type = 'BEZIER'
+    model_class = models.BezierModel
     dialog_class = dialogs.CurveNameDialog
     options_class = dialogs.BezierOptionsDialog
 
@@ -331,8 +574,8 @@ class BezierCurve(CurveWithHelpLine):
         super(BezierCurve, self).__init__(ui)
         self.size = 0
 
-    def create(self, data):
-        created = super(BezierCurve, self).create(data)
+    def create(self, data, samples=None, lazy=False):
+        created = super(BezierCurve, self).create(data, samples, lazy)
         self.size = len(self.points)
         return created
 
@@ -340,177 +583,76 @@ class BezierCurve(CurveWithHelpLine):
         super(BezierCurve, self).add_point(event, index)
         self.size += 1
 
-    def get_plot_functions(self):
-        self.help_line.set_data(self.xp, self.yp)
-
-        xs, ys = [], []
-
-        if len(self.points) >= 2:
-            xs, ys = self.bezier(self.points_2D).T
-        return xs, ys
-
-    @staticmethod
-    def bezier(points, num=200):
-        """
-        Build Bezier curve from points.
-        """
-        def _casteljau(x):
-            n = len(points)
-            W = np.zeros((n, n, 2))
-
-            for i in range(n):
-                W[0][i] = points[i]
-
-            for i in range(1, n):
-                for k in range(0, n-i):
-                    W[i][k] = (1 - x) * W[i-1][k] + x * W[i-1][k+1]
-            return W[n-1][0]
-
-        t = np.linspace(0, 1, num=num)
-
-        curve = map(_casteljau, t)
-        return np.array(curve)
-
     def degree_elevation(self, number):
-        """
-        Q[i] = i/n+1 * P[i-1] + (1 - i/n+1) * P[i] 1<=i<=n
-        """
-        for _ in range(number):
-            P = self.points  # control points
-            n = len(P)
-
-            Q = [0 for _ in range(n+1)]  # new control points
-            Q[0] = P[0]
-            Q[n] = P[n-1]
-            for i in range(1, n):
-                c = (i / float(n+1)) * np.array(P[i-1].cord) + (1 - i / float(n+1)) * np.array(P[i].cord)
-                Q[i] = Point(c[0], c[1], P[i].weight)
-
-            self.points = Q
+        old = self.points
+        homogeneous = self.model.homogeneous_points
+        self.model.elevate(number)
+        self.record('elevate', number=number)
+        if self.model.reduction_restores(homogeneous):
+            command = history.Elevate(self.model, number)
+        else:
+            command = history.SetPoints(
+                self.model, old.array.copy(), self.points.array.copy()
+            )
+        self.ui.history.push(command)
         self.update()
 
     def degree_reduction(self, number):
-        for _ in range(number):
-            n = len(self.points)
-            if n == self.size:
-                break
-
-            P = self.points  # control points
-            half = int(floor(n/2))
-
-            Q = [0 for _ in range(n+1)]  # new control points
-            W = [0 for _ in range(n)]  # calculate from first to floor(n/2)
-            Z = [0 for _ in range(n+1)]  # calculate from last to floor(n/2) + 1
-
-            Q[0] = P[0]
-            for i in range(1, n):
-                c = (i/n) * np.array(P[i-1].cord) + (1 - i/n) * np.array(P[i].cord)
-                Q[i] = Point(c[0], c[1], P[i].weight)
-
-            W[0] = Q[0]
-            for i in range(1, half):
-                c = (n * np.array(Q[i].cord) - i * np.array(W[i-1].cord)) / (n - i)
-                W[i] = Point(c[0], c[1], Q[i].weight)
-
-            Z[n-1] = Q[n-1]
-            for i in range(n-1, half, -1):
-                c = (n * np.array(Q[i].cord) - (n - i) * np.array(Z[i].cord)) / i
-                Z[i-1] = Point(c[0], c[1], Q[i].weight)
-
-            self.points = W[:half] + Z[half:n-1]
+        number = min(number, max(len(self.points) - self.size, 0))
+        old = self.points.array.copy()
+        self.model.reduce(number)
+        self.record('reduce', number=number)
+        self.ui.history.push(
+            history.SetPoints(self.model, old, self.points.array.copy())
+        )
         self.update()
 
     def split(self, t):
-        def _casteljau(points, x):
-            n = len(points)
-            W = np.zeros((n, n, 2))
+        return self.model.split(t)
 
-            for i in range(n):
-                W[0][i] = points[i]
+    def move_samples(self, index, old, new):
+        """
+        Update samples with rank-one change of dragged point, parameters
+        of samples are kept until drag ends.
+        """
+        if self.outline is None or not len(self.outline[0]):
+            return False
 
-            for i in range(1, n):
-                for k in range(0, n-i):
-                    W[i][k] = (1 - x) * W[i-1][k] + x * W[i-1][k+1]
-            return W
+        state = self.incremental
+        if state is None or state.grids[-1] is not self.t_list:
+            view = self.sample_view()
+            grids = [self.outline[0]]
+            if view[0] is not self.outline[0]:
+                grids.append(view[0])
+            state = self.incremental = incremental.IncrementalSamples(
+                self.model, grids
+            )
+        else:
+            state.move(index, old, new)
 
-        W = _casteljau(self.points_2D, t)
-        n = len(self.points) - 1
-        left = []
-        for i in range(n, -1, -1):
-            left.append(Point(*W[n-i][0]))
+        samples = state.samples()
+        self.outline = samples[0]
+        self.segments = None
+        self.lod_cache.clear()
+        if len(samples) > 1:
+            ax = self.ui.figure.add_subplot(111)
+            self.lod_cache.set(self.view_key(ax), samples[1])
 
-        right = []
-        for i in range(n, -1, -1):
-            right.append(Point(*W[i][n-i]))
-        return left, right
+        self.t_list, points = samples[-1]
+        self.help_line.set_data(self.xp, self.yp)
+        self.line.set_data(points.T)
+        return True
 
 
 class RationalBezierCurve(BezierCurve):
     type = 'RATIONAL_BEZIER'
+    model_class = models.RationalBezierModel
     dialog_class = dialogs.CurveNameDialog
 
     @property
     def weights(self):
-        return [p.weight for p in self.points]
-
-    def edit_point(self, data, index):
-        if data.get('w'):
-            self.points[index].weight = data.get('w')
-        super(RationalBezierCurve, self).edit_point(data, index)
-
-    def get_plot_functions(self):
-        self.help_line.set_data(self.xp, self.yp)
-
-        xs, ys = [], []
-
-        if len(self.xp) >= 2:
-            xs, ys = self.rational_bezier(self.points_2D).T
-        return xs, ys
+        return self.points.weights
 
-    def rational_bezier(self, points, num=200):
-        """
-        Build Rational Bezier curve from points.
-        """
-        points = np.array(points)
-
-        def _casteljau(x):
-            n = len(points)
-            W = np.zeros((n, n, 2))
-
-            for i in range(n):
-                W[0][i] = self.weights[i] * points[i]
-
-            for i in range(1, n):
-                for k in range(0, n-i):
-                    W[i][k] = (1 - x) * W[i-1][k] + x * W[i-1][k+1]
-            return W[n-1][0]
-
-        t = np.linspace(0, 1, num=num)
-
-        curve = map(_casteljau, t)
-        return np.array(curve)
-
-    def split(self, t):
-        def _casteljau(points, x):
-            points = np.array(points)
-            n = len(points)
-            W = np.zeros((n, n, 2))
-
-            for i in range(n):
-                W[0][i] = self.weights[i] * points[i]
-
-            for i in range(1, n):
-                for k in range(0, n-i):
-                    W[i][k] = (1 - x) * W[i-1][k] + x * W[i-1][k+1]
-            return W
-
-        W = _casteljau(self.points_2D, t)
-        n = len(self.points) - 1
-        left = []
-        for i in range(n, -1, -1):
-            left.append(Point(*W[n-i][0]))
-
-        right = []
-        for i in range(n, -1, -1):
-            right.append(Point(*W[i][n-i]))
-        return left, right
+    @property
+    def homogeneous_points(self):
+        return self.model.homogeneous_points
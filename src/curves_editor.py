@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
-import json
 import os
+import time
+
 import matplotlib as mp
 
 from PIL import Image
@@ -11,8 +12,10 @@ from PyQt5.uic import loadUiType
 import consts
 import curves
 import dialogs
-import utils
+import loader
+import scheduler
 import widgets
+from core import history, journal, project
 from figure import CustomFigure
 
 Ui_MainWindow, QMainWindow = loadUiType("designs/curves_editor_design.ui")
@@ -46,10 +49,21 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         self.ctrl_is_held = False
         self.canvas = None
         self.toolbar = None
+        self.load_timings = {}
+        self.scheduler = scheduler.RenderScheduler(self)
+        self.loader = loader.CurveLoader(self)
+        self.journal = journal.Journal(
+            consts.AUTOSAVE_DIRECTORY, self.journal_snapshot
+        )
+        self.history = history.History()
+        self.journal_timer = QtCore.QTimer()
+        self.journal_timer.timeout.connect(self.__check_journal)
+        self.journal_timer.start(consts.JOURNAL_CHECK)
         self.setup_ui(interface)
         self.custom_settings()
         self.bind_actions()
         self.show()
+        self.__recover_project()
 
     def setup_ui(self, interface):
         super(CurvesEditor, self).setupUi(self)
@@ -99,9 +113,11 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         self.action_open.triggered.connect(self.__open_project)
         self.action_save.triggered.connect(self.__save_project)
         self.action_save_as.triggered.connect(self.__save_file)
-        self.action_exit.triggered.connect(QtCore.QCoreApplication.quit)
+        self.action_exit.triggered.connect(self.close)
 
         # Actions edit
+        self.action_undo.triggered.connect(self.undo)
+        self.action_redo.triggered.connect(self.redo)
         self.action_parametric.triggered.connect(self.__draw_parametric_curve)
         self.action_interpolate.triggered.connect(
             self.__draw_interpolate_curve
@@ -135,7 +151,6 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
 
         self.canvas.mpl_disconnect(self.cid_press)
         self.canvas.mpl_disconnect(self.cid_release)
-        self.canvas.mpl_disconnect(self.cid_pick)
         self.canvas.mpl_disconnect(self.cid_motion)
         self.canvas.mpl_disconnect(self.cid_key_press)
         self.canvas.mpl_disconnect(self.cid_key_release)
@@ -158,10 +173,6 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
             'button_release_event',
             self.__on_release
         )
-        self.cid_pick = self.canvas.mpl_connect(
-            'pick_event',
-            self.__pick_point
-        )
         self.cid_motion = self.canvas.mpl_connect(
             'motion_notify_event',
             self.__move_point
@@ -196,12 +207,10 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         Click Alt + PPM to split curve.
         :param event:
         """
+        if not self.ctrl_is_held:
+            self.__pick_point(event)
         if self.ctrl_is_held and event.button == consts.BUTTONS.get('PPM'):
-            index = utils.check_index(
-                event.xdata,
-                self.active_curve.line.get_xdata()
-            )
-            self.bezier_split(self.active_curve.t_list[index])
+            self.__split_at(event)
         if event.button != consts.BUTTONS.get('LPM') or not self.active_curve:
             return
 
@@ -213,17 +222,81 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
 
     def __pick_point(self, event):
         """
-        Action for picking point. Click PPM to pick point.
+        Action for picking point. Click PPM to pick point. Point can be
+        picked from any curve, its curve becomes active.
         :param event:
         """
-        if event.artist != self.active_curve.help_line:
+        picked = self.pick_point(event)
+        if picked is None:
             return
 
+        curve, index = picked
+        if curve is not self.active_curve:
+            item = self.curves_list.list.findItems(
+                curve.name, QtCore.Qt.MatchFixedString
+            )[-1]
+            self.curves_list.list.setCurrentItem(item)
+            self.__change_curve(item)
+
         self.active_point['press'] = True
-        self.active_point['id'] = event.ind[0]
+        self.active_point['id'] = index
+        self.history.seal()
 
         if self.shift_is_held:
             self.active_curve.remove_point(self.active_point['id'])
+        elif event.button == consts.BUTTONS.get('PPM'):
+            self.figure.start_blit(
+                [self.active_curve.line, self.active_curve.help_line]
+            )
+
+    def __split_at(self, event):
+        """
+        Split active Bezier curve at point nearest to mouse.
+        :param event: mouse event
+        """
+        ax = event.inaxes
+        if ax is None or not isinstance(
+            self.active_curve, CURVE_TYPES['BEZIER']
+        ):
+            return
+
+        origin, unit = ax.transData.transform([(0, 0), (1, 1)])
+        found = self.active_curve.closest_point(
+            event.xdata, event.ydata, abs(unit - origin)
+        )
+        if found is not None:
+            self.bezier_split(found[0])
+
+    def pick_point(self, event):
+        """
+        Find control point nearest to mouse in all curves, active curve
+        wins when distances are equal.
+        :param event: mouse event
+        :return: curve, index or None
+        """
+        ax = event.inaxes
+        if ax is None:
+            return None
+
+        radius = consts.PICK_RADIUS
+        (x, y), (x1, y1) = ax.transData.inverted().transform(
+            [(event.x, event.y), (event.x + radius, event.y + radius)]
+        )
+        rx, ry = abs(x1 - x), abs(y1 - y)
+
+        curves = list(self.figure.curves.values())
+        if self.active_curve in curves:
+            curves.remove(self.active_curve)
+            curves.insert(0, self.active_curve)
+        best = None
+        for curve in curves:
+            if curve.type == 'PARAM' or not curve.materialized:
+                continue
+            found = curve.model.spatial_index().nearest(x, y, rx, ry)
+            if found is not None and (best is None or found[1] < best[2]):
+                best = curve, found[0], found[1]
+
+        return None if best is None else best[:2]
 
     def __move_point(self, event):
         """
@@ -239,18 +312,22 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
             'y': event.ydata
         }
 
-        self.active_curve.edit_point(data, self.active_point['id'])
-        self.canvas.draw()
+        self.active_curve.edit_point(data, self.active_point['id'], True)
+        self.figure.blit()
 
     def __on_release(self, event):
         """
         Clear states and update plot when action released.
         :param event:
         """
+        index = self.active_point['id']
         self.active_point['press'] = False
         self.active_point['id'] = None
+        self.figure.stop_blit()
+        self.history.seal()
         if self.active_curve:
-            self.update_plot()
+            self.active_curve.finish_edit()
+            self.update_plot(None if index is None else [index])
 
     def __handle_editing(self):
         self.active_curve.edit()
@@ -292,6 +369,9 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         self.__delete_curve()
         self.__add_curve(new_curve, data)
 
+    def newton_change_mode(self, mode):
+        self.active_curve.set_mode(mode)
+
     def bezier_degree_elevation(self, number):
         self.active_curve.degree_elevation(number)
 
@@ -348,6 +428,8 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         if not created:
             return
 
+        self.journal.record('add_curve', model=curve.save(shared=True))
+
         if self.active_curve:
             self.unbind_point_actions()
             mp.artist.setp(self.active_curve.line, linewidth=1)
@@ -374,11 +456,13 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         """
         self.unbind_point_actions()
         name = item.text()
+        self.loader.materialize([self.figure.curves[name]])
         self.__change_help_curve(self.figure.curves[name])
         mp.artist.setp(self.active_curve.line, linewidth=1)
         self.active_curve = self.figure.curves[name]
         mp.artist.setp(self.active_curve.line, linewidth=4)
         self.update_plot()
+        self.show_memory(self.active_curve)
 
         self.__toggle_curve_menu(True)
         self.bind_point_actions()
@@ -388,6 +472,8 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
 
         del self.figure.curves[name]
         self.active_curve.delete()
+        self.history.discard(self.active_curve.model)
+        self.journal.record('remove_curve', name)
 
         row = self.curves_list.list.currentRow()
         self.curves_list.list.takeItem(row)
@@ -395,6 +481,10 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         if item:
             self.__change_curve(item)
         else:
+            self.unbind_point_actions()
+            self.active_curve = None
+            self.active_point['press'] = False
+            self.active_point['id'] = None
             self.__toggle_curve_menu(False)
             self.__clear_curve_data()
 
@@ -403,6 +493,7 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         if cloned:
             new_curve = CURVE_TYPES[self.active_curve.type](self)
             self.__add_curve(new_curve, data)
+            self.show_memory(new_curve)
 
     def __change_help_curve(self, new_curve):
         if self.active_curve.type != 'PARAM':
@@ -410,8 +501,8 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         new_curve.help_line.set_visible(True)
 
     def __clear_curve_data(self):
-        self.curve_points.table.setRowCount(0)
-        self.rational_curve_points.table.setRowCount(0)
+        self.curve_points.model.set_curve(None)
+        self.rational_curve_points.model.set_curve(None)
 
     def __handle_add_figure(self):
         """
@@ -431,11 +522,15 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         """
         self.edit.menuAction().setVisible(True)
 
+        self.loader.clear()
         self.__clear_figure_data()
         self.__clear_curve_data()
 
+        self.history.clear()
         self.figure = CustomFigure(self)
         self.figure.create(name)
+        self.journal.start()
+        self.journal.compact()
 
     def __clear_figure_data(self):
         if self.figure:
@@ -470,23 +565,64 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         filename = dialog.open_file()
 
         if filename:
-            with open(filename) as infile:
-                data = json.load(infile)
-                infile.close()
+            data = project.load(filename)
 
             f_name = data.get('name')
             self.__add_figure(f_name)
+            self.__load_curves(reversed(data.get('curves')))
+
+    def __load_curves(self, curves_data):
+        """
+        Add many curves at once. Curves are created as lazy, only
+        selected curve is evaluated before first draw, the rest is
+        evaluated in background, visible ones first.
+        :param curves_data: list of saved curves
+        """
+        timings = {}
+        start = time.time()
 
-            for curve in reversed(data.get('curves')):
-                c_type = curve.get('type')
+        if self.active_curve:
+            self.unbind_point_actions()
+
+        created = []
+        for curve in curves_data:
+            c = CURVE_TYPES[curve.get('type')](self)
+            if c.create(c.load(curve.get('data')), lazy=True):
+                mp.artist.setp(c.line, linewidth=1)
+                if c.type != 'PARAM':
+                    c.help_line.set_visible(False)
+                self.figure.curves[c.name] = c
+                created.append(c)
+        timings['parse'] = time.time() - start
 
-                c = CURVE_TYPES[c_type](self)
-                c_data = c.load(curve.get('data'))
-                self.__add_curve(c, c_data)
+        if not created:
+            return
+
+        self.curves_list.list.addItems([c.name for c in created])
+        self.active_curve = created[-1]
+        self.active_curve.help_line.set_visible(True)
+        mp.artist.setp(self.active_curve.line, linewidth=4)
+        self.curves_list.list.setCurrentItem(self.get_curve_item())
+
+        self.loader.materialize([self.active_curve])
+        self.loader.add(created[:-1])
+        timings['first_frame'] = time.time() - start
+
+        self.update_plot()
+        self.__toggle_curve_menu(True)
+        self.bind_point_actions()
+
+        self.journal.compact()
+        self.load_timings = timings
+        self.statusBar().showMessage(
+            'Wczytano {} krzywych w {:.2f} s, pozostałe krzywe są '
+            'obliczane w tle'.format(len(created), timings['first_frame'])
+        )
 
     def __save_project(self):
         """
-        Save file as project.
+        Save file as project. Project is saved in binary format
+        when filename has .crv extension.
         Data format:
             {
                 name: 'xyz',
@@ -508,21 +644,100 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
                 ]
             }
         """
-        save_data = {
-            'name': self.figure.name,
-            'curves': [],
-        }
-        curves_list = []
-
-        for curve in self.figure.curves.values():
-            curves_list.append(curve.save())
-        save_data['curves'] = curves_list
+        save_data = project.from_models(
+            self.figure.name,
+            [curve.model for curve in self.figure.curves.values()]
+        )
 
         dialog = dialogs.SaveFileDialog()
         filename, ext = dialog.save()
-        with open(filename, 'w') as outfile:
-            json.dump(save_data, outfile)
-            outfile.close()
+        if filename:
+            project.save(filename, save_data)
+
+    def undo(self):
+        self.__apply_history(self.history.undo())
+
+    def redo(self):
+        self.__apply_history(self.history.redo())
+
+    def __apply_history(self, change):
+        """
+        Apply changes from history to their curve.
+        :param change: model, list of (action, params)
+        """
+        if change is None:
+            return
+
+        model, changes = change
+        for curve in self.figure.curves.values():
+            if curve.model is model:
+                curve.apply(changes)
+                if curve is self.active_curve:
+                    self.update_plot()
+                else:
+                    self.scheduler.request()
+                return
+
+    def show_memory(self, curve):
+        """
+        Show memory used by curve in status bar.
+        """
+        report = curve.memory()
+        self.statusBar().showMessage(
+            '{}: punkty {:.1f} kB własne, {:.1f} kB współdzielone, '
+            '{:.1f} kB mapowane, próbki {:.1f} kB'.format(
+                curve.name, report['owned'] / 1024.0,
+                report['shared'] / 1024.0, report['mapped'] / 1024.0,
+                report['samples'] / 1024.0
+            )
+        )
+
+    def journal_snapshot(self):
+        """
+        Get project with shared copies of points, used by journal
+        compaction.
+        """
+        return project.from_models(
+            self.figure.name,
+            [curve.model for curve in self.figure.curves.values()]
+        )
+
+    def __recover_project(self):
+        """
+        Recover project from journal left after crash.
+        """
+        try:
+            data = journal.recover(consts.AUTOSAVE_DIRECTORY)
+        except (IOError, OSError, ValueError):
+            data = None
+        if data is None:
+            return
+
+        answer = QtWidgets.QMessageBox.question(
+            self,
+            'Przywracanie projektu',
+            'Edytor nie został poprawnie zamknięty. '
+            'Przywrócić niezapisany projekt?'
+        )
+        if answer == QtWidgets.QMessageBox.Yes:
+            self.__add_figure(data.get('name'))
+            self.__load_curves(reversed(data.get('curves')))
+        else:
+            self.journal.discard()
+
+    def __check_journal(self):
+        """
+        Report errors of writing journal in background.
+        """
+        errors = self.journal.new_errors()
+        if errors:
+            self.statusBar().showMessage(
+                'Błąd automatycznego zapisu: {}'.format(errors[-1])
+            )
+
+    def closeEvent(self, event):
+        self.journal.close(discard=True)
+        super(CurvesEditor, self).closeEvent(event)
 
     def __save_file(self):
         """
@@ -581,30 +796,19 @@ class CurvesEditor(QMainWindow, Ui_MainWindow):
         curve = CURVE_TYPES['RATIONAL_BEZIER'](self)
         self.__handle_add_curve(curve)
 
-    def update_plot(self):
+    def update_plot(self, rows=None):
         """
-        Update plot data.
+        Schedule redraw of plot and points table.
+        :param rows: indexes of changed points, all when None
+        """
+        self.scheduler.request(table=True, rows=rows)
+
+    def update_points_table(self, rows=None):
+        """
+        Update points table data.
+        :param rows: indexes of changed points, all when None
         """
-        self.__clear_curve_data()
-        xp, yp = self.active_curve.help_line.get_data()
-        weights = []
         if isinstance(self.active_curve, CURVE_TYPES['RATIONAL_BEZIER']):
-            points_table = self.rational_curve_points
-            weights = self.active_curve.weights
+            self.rational_curve_points.show_curve(self.active_curve, rows)
         else:
-            points_table = self.curve_points
-
-        for i in range(len(xp)):
-            points_table.table.insertRow(i)
-            points_table.table.setItem(
-                i, 0, QtWidgets.QTableWidgetItem(str(xp[i]))
-            )
-            points_table.table.setItem(
-                i, 1, QtWidgets.QTableWidgetItem(str(yp[i]))
-            )
-            if weights:
-                points_table.table.setItem(
-                    i, 2, QtWidgets.QTableWidgetItem(str(weights[i]))
-                )
-
-        self.canvas.draw()
+            self.curve_points.show_curve(self.active_curve, rows)
@@ -5,6 +5,7 @@ from PyQt5.uic import loadUiType
 
 import consts
 import utils
+from core import expressions
 
 UI_ParamDialog, _ = loadUiType("designs/param_curve_dialog.ui")
 UI_NameCurveDialog, _ = loadUiType("designs/name_curve_dialog.ui")
@@ -27,7 +28,10 @@ class DialogMixin(QtWidgets.QDialog):
 
 class OptionsDialogMixin(DialogMixin):
     action = None
-    params = {}
+
+    def __init__(self, parent=None):
+        super(OptionsDialogMixin, self).__init__(parent)
+        self.params = {}
 
     def get_action(self):
         return self.action
@@ -97,6 +101,13 @@ class ParamDialog(DialogMixin, UI_ParamDialog):
             return False
         elif not self.function_y.text():
             return False
+
+        try:
+            expressions.parse_range(self.range_t.text())
+            expressions.compile_expression(self.function_x.text())
+            expressions.compile_expression(self.function_y.text())
+        except (ValueError, IndexError):
+            return False
         return True
 
 
@@ -147,11 +158,21 @@ class NewtonOptionsDialog(OptionsDialogMixin, UI_NewtonOptionsDialog):
     def __init__(self):
         super(NewtonOptionsDialog, self).__init__()
         self.convert.clicked.connect(self.__handle_convert)
+        self.change_mode.clicked.connect(self.__handle_change_mode)
+
+        for _, label in consts.INTERPOLATION_MODES:
+            self.mode.addItem(label)
 
     def __handle_convert(self):
         self.action = 'transform_newton_to_bezier'
         self.accept()
 
+    def __handle_change_mode(self):
+        self.action = 'newton_change_mode'
+        mode, _ = consts.INTERPOLATION_MODES[self.mode.currentIndex()]
+        self.params['mode'] = mode
+        self.accept()
+
 
 class BezierOptionsDialog(OptionsDialogMixin, UI_BezierOptionsDialog):
     def __init__(self):
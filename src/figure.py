@@ -5,6 +5,8 @@ from matplotlib.backends.backend_qt5agg import (
 )
 from matplotlib.figure import Figure
 
+from core import stacked
+
 
 class CustomFigure(Figure):
     curves = {}
@@ -14,20 +16,121 @@ class CustomFigure(Figure):
         super(CustomFigure, self).__init__(*args, **kwargs)
         self.ui = ui
         self.name = ''
+        self.curves = {}
+        self.view_dirty = False
+        self.animated = []
+        self.background = None
+        self.drawn = False
 
     def create(self, name):
         self.name = name
         ax = self.add_subplot(111)
         ax.set_title(name)
+        ax.callbacks.connect('xlim_changed', self.view_changed)
+        ax.callbacks.connect('ylim_changed', self.view_changed)
         self.draw_figure()
 
     def draw_figure(self):
         self.clear()
         self.ui.canvas = FigureCanvas(self)
+        self.ui.canvas.mpl_connect('resize_event', self.view_changed)
         self.ui.draw_layout.addWidget(self.ui.canvas)
         self.ui.canvas.draw()
         self.ui.add_toolbar()
 
+    def view_changed(self, *args):
+        """
+        Mark curves for resampling after pan, zoom or resize.
+        Resampling is done once, before next draw.
+        """
+        self.view_dirty = True
+
+    def start_blit(self, artists):
+        """
+        Draw everything except given artists once and keep it
+        as background, so only artists are redrawn while they change.
+        :param artists: list of artists from one axes
+        """
+        self.animated = artists
+        for artist in artists:
+            artist.set_animated(True)
+
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(artists[0].axes.bbox)
+        self.blit()
+
+    def blit(self):
+        """
+        Redraw animated artists on cached background.
+        """
+        if self.background is None:
+            return
+
+        ax = self.animated[0].axes
+        self.canvas.restore_region(self.background)
+        for artist in self.animated:
+            ax.draw_artist(artist)
+        self.canvas.blit(ax.bbox)
+
+    def stop_blit(self):
+        for artist in self.animated:
+            artist.set_animated(False)
+        self.animated = []
+        self.background = None
+
+    def draw_over(self, artists):
+        """
+        Draw artists over last drawn figure instead of drawing it whole.
+        Result is the same when artists were empty in last drawing,
+        e.g. lines of lazily created curves, and view hasn't changed.
+        :param artists: list of artists from one axes
+        :return: drawn :type boolean
+        """
+        if self.view_dirty or self.background is not None or not self.drawn:
+            return False
+        if not artists:
+            return True
+
+        ax = artists[0].axes
+        for artist in artists:
+            ax.draw_artist(artist)
+        self.canvas.blit(ax.bbox)
+        return True
+
+    def draw(self, renderer):
+        if self.view_dirty:
+            self.view_dirty = False
+            self.resample()
+            self.ui.loader.prioritize()
+        super(CustomFigure, self).draw(renderer)
+        self.drawn = True
+
+    def resample(self):
+        """
+        Update all curves for current view. Missing samples of Bezier
+        curves are computed for all of them at once.
+        """
+        ax = self.add_subplot(111)
+        pending = []
+        domains = []
+        for curve in self.curves.values():
+            if not stacked.is_stackable(curve.model):
+                continue
+            domain = curve.missing_view(ax)
+            if domain is not None:
+                pending.append(curve)
+                domains.append(domain)
+
+        if pending:
+            stack = stacked.CurveStack([c.model for c in pending])
+            samples = stack.sample(ax.transData.transform, domains=domains)
+            for curve, curve_samples in zip(pending, samples):
+                if curve_samples is not None:
+                    curve.add_view(ax, curve_samples)
+
+        for curve in self.curves.values():
+            curve.resample_view()
+
     def clear(self):
         if self.canvas:
             self.ui.draw_layout.removeWidget(self.ui.canvas)
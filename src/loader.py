@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+import time
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+from PyQt5 import QtCore
+
+from core import stacked
+from scheduler import FRAME_BUDGET
+
+BATCH = 32  # most curves evaluated at once
+COST_SMOOTHING = 0.5  # weight of last batch in average cost of curve
+
+
+def sample_model(args):
+    """
+    Sample curve model in worker thread.
+    :return: t, points or None when curve can't be evaluated
+    """
+    model, size = args
+    if not model.is_drawable():
+        return np.array([]), np.zeros((0, 2))
+
+    try:
+        return model.sample(size=size)
+    except Exception:
+        return None
+
+
+class CurveLoader(object):
+    """
+    Evaluate lazily created curves in background, curves visible
+    in current view first.
+    """
+
+    def __init__(self, ui, budget=FRAME_BUDGET, processes=None):
+        self.ui = ui
+        self.budget = budget
+        self.processes = processes or cpu_count()
+        self.batch = max(self.processes, BATCH)
+        self.pool = None
+        self.queue = []
+        self.loaded = 0
+        self.failed = []
+        self.start = None
+        self.cost = None  # average time of evaluating one curve in seconds
+        self.evaluated = []  # points of curves not fitted into view yet
+
+        self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.step)
+
+    def add(self, curves):
+        """
+        Queue curves for evaluation.
+        :param curves: list of curves created as lazy
+        """
+        if not self.queue:
+            self.start = time.time()
+        self.queue.extend(curves)
+        self.prioritize()
+        if self.queue and not self.timer.isActive():
+            self.timer.start(0)
+
+    def clear(self):
+        self.timer.stop()
+        self.queue = []
+
+    def materialize(self, curves):
+        """
+        Evaluate given curves immediately.
+        :param curves: list of curves
+        :return: curves that couldn't be evaluated :type list
+        """
+        pending = [c for c in curves if not c.materialized]
+        if pending and self.queue:
+            removed = set(pending)
+            self.queue = [c for c in self.queue if c not in removed]
+        failed = self.evaluate(pending)
+        self.autoscale()
+        return failed
+
+    def evaluate(self, pending):
+        """
+        Evaluate curves which are not queued, limits of view are
+        not updated.
+        :return: curves that couldn't be evaluated :type list
+        """
+        if not pending:
+            return []
+
+        ax = self.ui.figure.add_subplot(111)
+        size = (ax.bbox.width, ax.bbox.height)
+        samples = self.sample([c.model for c in pending], size)
+
+        failed = []
+        for curve, curve_samples in zip(pending, samples):
+            if curve_samples is None:
+                failed.append(curve)
+                curve_samples = np.array([]), np.zeros((0, 2))
+            curve.materialize(curve_samples)
+            lines = [curve.line]
+            if getattr(curve, 'help_line', None) is not None:
+                lines.insert(0, curve.help_line)  # order of drawing
+            self.evaluated.extend(line.get_xydata() for line in lines)
+            self.ui.scheduler.request(added=lines)
+
+        self.loaded += len(pending)
+        self.failed.extend(failed)
+        return failed
+
+    def step(self):
+        """
+        Evaluate queued curves within budget and schedule next step
+        while there are curves left. Curves are evaluated in batches
+        sized by average cost of curve, so budget is exceeded by about
+        one curve at most.
+        """
+        start = time.time()
+        while self.queue:
+            left = self.budget / 1000.0 - (time.time() - start)
+            if left <= 0:
+                break
+            count = self.batch_size(left)
+            batch = self.queue[:count]
+            del self.queue[:count]
+
+            batch_start = time.time()
+            self.evaluate([c for c in batch if not c.materialized])
+            cost = (time.time() - batch_start) / len(batch)
+            if self.cost is None:
+                self.cost = cost
+            else:
+                self.cost += COST_SMOOTHING * (cost - self.cost)
+        self.autoscale()
+
+        if self.queue:
+            self.timer.start(0)
+        else:
+            self.ui.statusBar().showMessage(
+                'Obliczono wszystkie krzywe w {:.2f} s'.format(
+                    time.time() - self.start
+                )
+            )
+
+    def autoscale(self):
+        """
+        Extend limits of view by curves evaluated since last call,
+        cheaper than relim going through all curves.
+        """
+        points = [p for p in self.evaluated if len(p)]
+        self.evaluated = []
+        ax = self.ui.figure.add_subplot(111)
+        if not points or not ax.get_autoscale_on():
+            return
+
+        points = np.concatenate(points)
+        points = points[np.isfinite(points).all(axis=1)]
+        if len(points):
+            ax.update_datalim(points)
+            ax.autoscale_view()
+
+    def batch_size(self, left):
+        """
+        Get number of curves which can be evaluated in left time,
+        one curve while cost is unknown.
+        :param left: time left in seconds
+        """
+        if self.cost is None:
+            return 1
+        if self.cost <= 0:
+            return self.batch
+        return int(min(max(left / self.cost, 1), self.batch))
+
+    def sample(self, models, size):
+        """
+        Sample curve models, Bezier curves are evaluated all at once,
+        other curves in pool of threads.
+        :return: t, points or None for every model :type list
+        """
+        samples = [None] * len(models)
+        stackable = []
+        other = []
+        for i, model in enumerate(models):
+            if stacked.is_stackable(model) and model.is_drawable():
+                stackable.append(i)
+            else:
+                other.append(i)
+
+        if stackable:
+            stack = stacked.CurveStack([models[i] for i in stackable])
+            for i, curve_samples in zip(stackable, stack.sample(size=size)):
+                samples[i] = curve_samples
+
+        if len(other) == 1:
+            samples[other[0]] = sample_model((models[other[0]], size))
+        elif other:
+            results = self.get_pool().map(
+                sample_model, [(models[i], size) for i in other]
+            )
+            for i, curve_samples in zip(other, results):
+                samples[i] = curve_samples
+        return samples
+
+    def prioritize(self):
+        """
+        Sort queued curves, ones intersecting current view first,
+        then by distance from view center.
+        """
+        if not self.queue:
+            return
+
+        ax = self.ui.figure.add_subplot(111)
+        x_min, x_max = sorted(ax.get_xlim())
+        y_min, y_max = sorted(ax.get_ylim())
+        center = (x_min + x_max) / 2.0, (y_min + y_max) / 2.0
+
+        def key(curve):
+            bounds = curve.bounds()
+            if bounds is None:
+                return 0, 0
+            visible = (
+                bounds[0] <= x_max and bounds[2] >= x_min and
+                bounds[1] <= y_max and bounds[3] >= y_min
+            )
+            distance = np.hypot(
+                (bounds[0] + bounds[2]) / 2.0 - center[0],
+                (bounds[1] + bounds[3]) / 2.0 - center[1]
+            )
+            return int(not visible), distance
+
+        self.queue.sort(key=key)
+
+    def get_pool(self):
+        if self.pool is None:
+            self.pool = ThreadPool(self.processes)
+        return self.pool
+
+    @property
+    def stats(self):
+        return {
+            'loaded': self.loaded,
+            'pending': len(self.queue),
+            'failed': len(self.failed)
+        }
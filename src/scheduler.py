@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt5 import QtCore
+
+FRAME_BUDGET = 1000 / 60.0  # minimal time between redraws in ms
+
+
+class RenderScheduler(object):
+    """
+    Collect redraw requests and redraw figure once per frame. When all
+    requests only added artists, e.g. evaluated lazy curves, they are
+    drawn over last frame instead of drawing whole figure. Dragged curve
+    is redrawn alone by blitting in CustomFigure.
+    """
+
+    def __init__(self, ui, budget=FRAME_BUDGET):
+        self.ui = ui
+        self.budget = budget
+        self.refresh_table = False
+        self.rows = set()
+        self.added = []
+        self.full = False
+        self.requested = 0
+        self.performed = 0
+        self.overlaid = 0
+        self.last_draw = 0
+
+        self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def request(self, table=False, rows=None, added=None):
+        """
+        Schedule redraw of figure.
+        :param table: points table of active curve has to be refreshed
+        :param rows: changed rows of points table, all when None
+        :param added: artists which were empty in last frame and are
+            the only change, whole figure is redrawn when None
+        """
+        self.requested += 1
+        if added is None:
+            self.full = True
+        else:
+            self.added.extend(added)
+        if table:
+            if rows is None or self.rows is None:
+                self.rows = None
+            else:
+                self.rows.update(rows)
+            self.refresh_table = True
+
+        if not self.timer.isActive():
+            elapsed = (time.time() - self.last_draw) * 1000
+            self.timer.start(max(0, int(self.budget - elapsed)))
+
+    def flush(self):
+        """
+        Perform scheduled redraw.
+        """
+        self.timer.stop()
+
+        curve = self.ui.active_curve
+        if self.refresh_table and curve in self.ui.figure.curves.values():
+            self.ui.update_points_table(
+                None if self.rows is None else sorted(self.rows)
+            )
+        if self.full or not self.ui.figure.draw_over(self.added):
+            self.ui.canvas.draw_idle()
+        else:
+            self.overlaid += 1
+
+        self.performed += 1
+        self.last_draw = time.time()
+        self.refresh_table = False
+        self.rows = set()
+        self.added = []
+        self.full = False
+
+    @property
+    def stats(self):
+        return {
+            'requested': self.requested,
+            'performed': self.performed,
+            'overlaid': self.overlaid,
+            'pending': self.timer.isActive()
+        }
@@ -2,7 +2,7 @@
 
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
 from PIL import Image
-from PyQt5 import QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.uic import loadUiType
 
 import consts
@@ -52,7 +52,7 @@ class CustomNavigationToolbar(NavigationToolbar2QT):
             y0, y1 = ax.get_ylim()
             ax.imshow(img, extent=[x0, x1, y0, y1], aspect='auto')
 
-            self.canvas.draw()
+            self.ui.scheduler.request()
 
     def pan(self, *args):
         super(CustomNavigationToolbar, self).pan(*args)
@@ -75,28 +75,142 @@ class WidgetMixin(QtWidgets.QWidget):
         self.setupUi(self)
 
 
+class PointsTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model over points of curve.
+    Edits go straight to the curve, views only ask for visible cells.
+    """
+
+    def __init__(self, ui, columns, parent=None):
+        super(PointsTableModel, self).__init__(parent)
+        self.ui = ui
+        self.columns = columns
+        self.curve = None
+        self.rows = 0
+
+    def set_curve(self, curve):
+        self.beginResetModel()
+        self.curve = curve
+        self.rows = len(curve.points) if curve else 0
+        self.endResetModel()
+
+    def points_changed(self, rows=None):
+        """
+        Notify views about changed points.
+        :param rows: indexes of changed points, all when None
+        """
+        if self.curve is None or len(self.curve.points) != self.rows:
+            self.set_curve(self.curve)
+            return
+
+        if rows is None:
+            rows = [0, self.rows - 1]
+        rows = [r for r in rows if 0 <= r < self.rows]
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows), 0),
+                self.index(max(rows), len(self.columns) - 1)
+            )
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.rows
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role not in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return None
+
+        point = self.curve.points[index.row()]
+        return str(point.save()[index.column()])
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.columns[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        return (
+            QtCore.Qt.ItemIsEnabled |
+            QtCore.Qt.ItemIsSelectable |
+            QtCore.Qt.ItemIsEditable
+        )
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if role != QtCore.Qt.EditRole:
+            return False
+        return self.set_values({(index.row(), index.column()): value})
+
+    def set_values(self, values):
+        """
+        Change many cells with one curve update.
+        :param values: dict {(row, column): value}
+        :return: changed :type boolean
+        """
+        changes = {}
+        for (row, column), value in values.items():
+            if not (0 <= row < self.rows and 0 <= column < len(self.columns)):
+                continue
+            try:
+                value = float(value)
+            except ValueError:
+                continue
+            changes.setdefault(row, {})[self.columns[column]] = value
+
+        if not changes:
+            return False
+
+        self.curve.edit_points(changes)
+        self.points_changed(changes.keys())
+        self.ui.scheduler.request()
+        return True
+
+
 class CurvePointsMixin(WidgetMixin):
+    columns = ('x', 'y')
+
     def __init__(self, parent=None):
         super(CurvePointsMixin, self).__init__(parent)
         self.ui = parent
-        self.table.cellChanged.connect(self.__handle_update)
+        self.model = PointsTableModel(parent, self.columns, self)
+        self.table.setModel(self.model)
+
+        paste = QtWidgets.QShortcut(
+            QtGui.QKeySequence.Paste, self.table, self.__paste
+        )
+        paste.setContext(QtCore.Qt.WidgetShortcut)
+
+    def show_curve(self, curve, rows=None):
+        if self.model.curve is curve:
+            self.model.points_changed(rows)
+        else:
+            self.model.set_curve(curve)
 
-    def __handle_update(self, *args, **kwargs):
-        row, col = args
-        item = self.table.currentItem()
+    def __paste(self):
+        """
+        Paste block of values copied from spreadsheet, starting
+        at current cell.
+        """
+        current = self.table.currentIndex()
+        if not current.isValid():
+            return
 
-        if item:
-            data = {}
-            value = float(item.text())
-            if col == 0:
-                data['x'] = value
-            elif col == 1:
-                data['y'] = value
-            elif col == 2:
-                data['w'] = value
+        text = QtWidgets.QApplication.clipboard().text()
+        values = {}
+        for i, line in enumerate(text.strip('\n').split('\n')):
+            for j, value in enumerate(line.split('\t')):
+                values[(current.row() + i, current.column() + j)] = value
 
-            self.ui.active_curve.edit_point(data, row)
-            self.ui.canvas.draw()
+        self.model.set_values(values)
 
 
 class CurvesList(WidgetMixin, UI_CurvesList):
@@ -112,4 +226,4 @@ class CurvePoints(CurvePointsMixin, UI_CurvePoints):
 
 
 class RationalCurvePoints(CurvePointsMixin, UI_RationalCurvePoints):
-    pass
+    columns = ('x', 'y', 'w')
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+import evaluation  # noqa: E402
+
+
+class BernsteinTest(unittest.TestCase):
+    def test_rows_sum_to_one_for_high_degrees(self):
+        t = np.linspace(0, 1, 101)
+        for n in (3, 1000, 1030, 1500, 3000):
+            basis = evaluation.bernstein_matrix(n, t, cache=False)
+            self.assertTrue(np.isfinite(basis).all(), n)
+            self.assertTrue((basis >= 0).all(), n)
+            np.testing.assert_allclose(basis.sum(axis=1), 1, atol=1e-10)
+
+    def test_end_points(self):
+        basis = evaluation.bernstein_matrix(1500, [0, 1], cache=False)
+        np.testing.assert_array_equal(basis[0, 0], 1)
+        np.testing.assert_array_equal(basis[1, -1], 1)
+        self.assertEqual(basis[0, 1:].max(), 0)
+        self.assertEqual(basis[1, :-1].max(), 0)
+
+    def test_high_degree_line(self):
+        n = 1500
+        points = np.column_stack((np.linspace(0, 1, n + 1), np.zeros(n + 1)))
+        t = np.linspace(0, 1, 57)
+        values = evaluation.bezier(points, t, cache=False)
+        np.testing.assert_allclose(values[:, 0], t, atol=1e-10)
+
+    def test_elevation_of_high_degree(self):
+        matrix = evaluation.elevation_matrix(1200, 1205)
+        self.assertTrue(np.isfinite(matrix).all())
+        np.testing.assert_allclose(matrix.sum(axis=1), 1, atol=1e-10)
+
+    def test_basis_column(self):
+        t = np.linspace(0, 1, 31)
+        for n in (5, 1500):
+            basis = evaluation.bernstein_matrix(n, t, cache=False)
+            np.testing.assert_allclose(
+                evaluation.basis_column(n, 2, t), basis[:, 2]
+            )
+
+
+class BasisCacheTest(unittest.TestCase):
+    def setUp(self):
+        evaluation._basis_cache.clear()
+
+    def stats(self):
+        return evaluation.cache_stats()['basis']
+
+    def counts(self):
+        return self.stats()['hits'], self.stats()['misses']
+
+    def test_equal_grids_share_matrix(self):
+        matrix = evaluation.bernstein_matrix(5, np.linspace(0, 1, 50))
+        again = evaluation.bernstein_matrix(5, np.linspace(0, 1, 50))
+        self.assertIs(again, matrix)
+        self.assertFalse(matrix.flags.writeable)
+        self.assertEqual(self.counts(), (1, 1))
+
+    def test_different_grids_and_degrees(self):
+        t = np.linspace(0, 1, 50)
+        evaluation.bernstein_matrix(5, t)
+        evaluation.bernstein_matrix(6, t)
+        evaluation.bernstein_matrix(5, t[:-1])
+        evaluation.bernstein_matrix(5, t.astype(np.float32))
+        self.assertEqual(self.stats()['size'], 4)
+        self.assertEqual(self.stats()['hits'], 0)
+
+    def test_uncached_grids_are_not_stored(self):
+        t = np.linspace(0, 1, 50)
+        matrix = evaluation.bernstein_matrix(5, t, cache=False)
+        points = np.random.RandomState(0).rand(6, 2)
+        evaluation.bezier(points, t, cache=False)
+        evaluation.derivatives(points, t, cache=False)
+        self.assertEqual(self.stats()['size'], 0)
+        np.testing.assert_array_equal(
+            matrix, evaluation.bernstein_matrix(5, t)
+        )
+
+    def test_hash_collision_is_miss(self):
+        t = np.linspace(0, 1, 50)
+        other = np.linspace(0, 1, 50) ** 2
+        key = ('basis', 5, t.dtype.str, len(t), hash(t.tobytes()))
+        wrong = evaluation.bernstein_matrix(5, other, cache=False)
+        evaluation._basis_cache.set(key, (other.tobytes(), wrong))
+
+        matrix = evaluation.bernstein_matrix(5, t)
+        np.testing.assert_array_equal(
+            matrix, evaluation.bernstein_matrix(5, t, cache=False)
+        )
+        self.assertEqual(self.counts(), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
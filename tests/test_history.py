@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+import history  # noqa: E402
+import models  # noqa: E402
+from point import PointSet  # noqa: E402
+
+
+def apply(model, changes):
+    for action, params in changes:
+        getattr(model, action)(**params)
+
+
+class ElevateTest(unittest.TestCase):
+    def check_undo(self, model):
+        old = model.points.array.copy()
+        homogeneous = model.homogeneous_points
+        model.elevate(4)
+        self.assertTrue(model.reduction_restores(homogeneous))
+        elevated = model.points.array.copy()
+
+        log = history.History()
+        log.push(history.Elevate(model, 4))
+        self.assertEqual(log.size, history.COMMAND_SIZE)
+
+        apply(*log.undo())
+        np.testing.assert_allclose(model.points.array, old, atol=1e-12)
+        apply(*log.redo())
+        np.testing.assert_allclose(model.points.array, elevated, atol=1e-12)
+
+    def test_polynomial(self):
+        model = models.BezierModel('curve')
+        model.points = PointSet.from_array(
+            np.random.RandomState(0).rand(8, 2)
+        )
+        self.check_undo(model)
+
+    def test_rational(self):
+        model = models.RationalBezierModel('curve')
+        random = np.random.RandomState(1)
+        model.points = PointSet.from_array(
+            random.rand(8, 2), random.rand(8) + 0.5
+        )
+        self.check_undo(model)
+
+    def test_inexact_reduction_is_detected(self):
+        for size in (101, 1001):
+            model = models.BezierModel('curve')
+            model.points = PointSet.from_array(
+                np.random.RandomState(2).rand(size, 2)
+            )
+            homogeneous = model.homogeneous_points
+            model.elevate(20)
+            self.assertFalse(model.reduction_restores(homogeneous), size)
+
+    def test_single_point_is_not_restored(self):
+        model = models.BezierModel('curve')
+        model.points = PointSet.from_array(np.array([[0.5, 0.5]]))
+        homogeneous = model.homogeneous_points
+        model.elevate(2)
+        self.assertFalse(model.reduction_restores(homogeneous))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+import models  # noqa: E402
+from incremental import IncrementalSamples  # noqa: E402
+from point import PointSet  # noqa: E402
+
+
+def point_data(model, index):
+    return dict(zip(('x', 'y', 'w'), model.points[index].save()))
+
+
+class IncrementalSamplesTest(unittest.TestCase):
+    def drag(self, model, index, moves):
+        grids = [np.linspace(0, 1, 200), np.linspace(0.2, 0.6, 73)]
+        samples = IncrementalSamples(model, grids, refresh_every=64)
+        for k in range(moves):
+            old = point_data(model, index)
+            model.set_point(index, {'x': 0.5 + 0.01 * k, 'y': 0.3 - 0.02 * k})
+            samples.move(index, old, point_data(model, index))
+        return samples
+
+    def check(self, model, samples):
+        for t, points in samples.samples():
+            np.testing.assert_allclose(
+                points, model.evaluate(t, cache=False), atol=1e-10
+            )
+
+    def test_polynomial_drag(self):
+        model = models.BezierModel('curve')
+        model.points = PointSet.from_array(
+            np.random.RandomState(0).rand(12, 2)
+        )
+        samples = self.drag(model, 5, 150)
+        self.check(model, samples)
+        self.assertEqual(list(samples.columns), [5])
+
+    def test_rational_drag(self):
+        model = models.RationalBezierModel('curve')
+        random = np.random.RandomState(1)
+        model.points = PointSet.from_array(
+            random.rand(9, 2), random.rand(9) + 0.5
+        )
+        self.check(model, self.drag(model, 3, 100))
+
+    def test_refresh_drops_accumulated_moves(self):
+        model = models.BezierModel('curve')
+        model.points = PointSet.from_array(
+            np.random.RandomState(2).rand(6, 2)
+        )
+        samples = self.drag(model, 2, 64)
+        self.assertEqual(samples.moves, 64)
+        old = point_data(model, 2)
+        model.set_point(2, {'x': 0.1, 'y': 0.1})
+        samples.move(2, old, point_data(model, 2))
+        self.assertEqual(samples.moves, 0)
+        self.check(model, samples)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+from interpolation import Barycentric, DividedDifferences  # noqa: E402
+
+
+class InterpolationTest(object):
+    """
+    Updated polynomial has to match one built from the same nodes.
+    """
+    interpolation_class = None
+
+    def setUp(self):
+        random = np.random.RandomState(0)
+        self.xs = np.linspace(-5, 5, 12) + random.uniform(-0.1, 0.1, 12)
+        self.ys = random.rand(12)
+        self.at = np.linspace(-5, 5, 101)
+
+    def check(self, interpolation, xs, ys):
+        built = self.interpolation_class(xs, ys)
+        np.testing.assert_array_equal(interpolation.nodes, xs)
+        np.testing.assert_allclose(
+            interpolation.evaluate(self.at), built.evaluate(self.at),
+            rtol=1e-8, atol=1e-8
+        )
+        np.testing.assert_allclose(
+            interpolation.evaluate(xs), ys, rtol=1e-8, atol=1e-8
+        )
+
+    def test_append(self):
+        interpolation = self.interpolation_class()
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            interpolation.append(x, y)
+            self.check(interpolation, self.xs[:i+1], self.ys[:i+1])
+
+    def test_insert_and_remove(self):
+        interpolation = self.interpolation_class(self.xs, self.ys)
+        interpolation.insert(3, 2.5, 0.25)
+        self.check(
+            interpolation, np.insert(self.xs, 3, 2.5),
+            np.insert(self.ys, 3, 0.25)
+        )
+        for index in (3, 0, len(self.xs) - 2):
+            interpolation.remove(index)
+        xs = np.delete(self.xs, (0, len(self.xs) - 1))
+        ys = np.delete(self.ys, (0, len(self.ys) - 1))
+        self.check(interpolation, xs, ys)
+
+    def test_set_node(self):
+        interpolation = self.interpolation_class(self.xs, self.ys)
+        interpolation.set_node(4, -1.5, 2.0)
+        interpolation.set_node(5, self.xs[5], -1.0)
+        xs, ys = self.xs.copy(), self.ys.copy()
+        xs[4], ys[4], ys[5] = -1.5, 2.0, -1.0
+        self.check(interpolation, xs, ys)
+
+
+class DividedDifferencesTest(InterpolationTest, unittest.TestCase):
+    interpolation_class = DividedDifferences
+
+
+class BarycentricTest(InterpolationTest, unittest.TestCase):
+    interpolation_class = Barycentric
+
+
+if __name__ == '__main__':
+    unittest.main()
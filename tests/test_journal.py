@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+import journal  # noqa: E402
+import models  # noqa: E402
+import project  # noqa: E402
+from point import PointSet  # noqa: E402
+
+
+class RecoverTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.curves = OrderedDict()
+        self.journal = journal.Journal(
+            self.directory, self.snapshot, compact_every=10 ** 6
+        )
+        self.journal.start()
+        self.journal.compact()
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.directory)
+
+    def snapshot(self):
+        return project.from_models('figure', list(self.curves.values()))
+
+    def add(self, model):
+        self.curves[model.name] = model
+        self.journal.record('add_curve', model=model.to_dict(shared=True))
+
+    def change(self, name, action, **params):
+        getattr(self.curves[name], action)(**params)
+        self.journal.record(action, name, **params)
+
+    def write_changes(self):
+        bezier = models.BezierModel('bezier')
+        bezier.points = PointSet.from_array(
+            np.random.RandomState(0).rand(20, 2)
+        )
+        self.add(bezier)
+        newton = models.NewtonModel('newton')
+        newton.points = PointSet.from_array(
+            np.column_stack((np.arange(5.0), np.arange(5.0) ** 2))
+        )
+        self.add(newton)
+
+        self.change('bezier', 'insert_point', index=3, point=[0.5, 0.5, 1])
+        self.change('bezier', 'set_point', index=0, data={'x': 2, 'y': 3})
+        self.change('newton', 'remove_point', index=1)
+
+    def write_more_changes(self):
+        self.change('bezier', 'translate', x=1.5, y=-1)
+        self.change('bezier', 'elevate', number=2)
+        self.change('newton', 'set_mode', mode='barycentric')
+        self.change('newton', 'set_point', index=2, data={'x': 2.5, 'y': 1})
+
+    def journal_lines(self):
+        with open(self.journal.journal_path) as infile:
+            return infile.readlines()
+
+    def append_lines(self, lines):
+        with open(self.journal.journal_path, 'a') as outfile:
+            outfile.writelines(lines)
+
+    def check_recovered(self):
+        self.journal.flush()
+        data = journal.recover(self.directory)
+        recovered = dict(
+            (c['data']['name'], c['data']) for c in data['curves']
+        )
+        self.assertEqual(sorted(recovered), sorted(self.curves))
+        for name, model in self.curves.items():
+            np.testing.assert_allclose(
+                recovered[name]['points'].array, model.points.array
+            )
+        self.assertEqual(
+            recovered['newton']['mode'], self.curves['newton'].mode
+        )
+
+    def test_recover_entries_without_compaction(self):
+        self.write_changes()
+        self.write_more_changes()
+        self.check_recovered()
+
+    def test_recover_after_compaction(self):
+        self.write_changes()
+        self.journal.compact()
+        self.write_more_changes()
+        self.check_recovered()
+        self.assertEqual(self.journal.compactions, 2)
+        self.assertEqual(len(self.journal_lines()), 4)
+
+    def test_entries_in_snapshot_are_skipped(self):
+        self.write_changes()
+        self.journal.flush()
+        # added curves would be rebuilt from scratch, keep only changes
+        stale = [
+            line for line in self.journal_lines()
+            if 'add_curve' not in line
+        ]
+        self.journal.compact()
+        self.write_more_changes()
+        self.journal.flush()
+        # crash between writing snapshot and truncating journal
+        lines = self.journal_lines()
+        with open(self.journal.journal_path, 'w') as outfile:
+            outfile.writelines(stale + lines)
+        self.check_recovered()
+
+    def test_incomplete_last_line_is_skipped(self):
+        self.write_changes()
+        self.write_more_changes()
+        self.journal.flush()
+        self.append_lines(['{"a":"remove_point","c":"bezier","in'])
+        self.check_recovered()
+
+    def test_rename(self):
+        self.write_changes()
+        model = self.curves.pop('bezier')
+        model.name = 'renamed'
+        self.curves['renamed'] = model
+        self.journal.record('set_data', 'bezier', data=model.settings())
+        self.check_recovered()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+import models  # noqa: E402
+import project  # noqa: E402
+from point import PointSet  # noqa: E402
+
+
+class SaveOverSelfTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'project.crv')
+
+        model = models.BezierModel('curve')
+        self.points = np.random.RandomState(0).rand(200000, 3)
+        model.points = PointSet.from_array(self.points)
+        project.save(self.filename, project.from_models('figure', [model]))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_mapped_project_over_its_file(self):
+        data = project.load(self.filename)
+        points = data['curves'][0]['data']['points']
+        self.assertIsInstance(points.array.base, np.memmap)
+
+        project.save(self.filename, data)
+
+        saved = project.load(self.filename, mmap=False)
+        points = saved['curves'][0]['data']['points'].array
+        np.testing.assert_array_equal(points, self.points)
+        self.assertEqual(os.listdir(self.directory), ['project.crv'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+import models  # noqa: E402
+from point import PointSet  # noqa: E402
+from projection import SegmentTree, closest_point  # noqa: E402
+
+
+def segment_distances(points, position, scale):
+    a = points[:-1] * scale
+    ab = points[1:] * scale - a
+    q = np.asarray(position) * scale
+    length = (ab * ab).sum(axis=1)
+    u = ((q - a) * ab).sum(axis=1) / np.where(length > 0, length, 1)
+    u = np.clip(u, 0, 1)
+    return np.hypot(*(a + u[:, None] * ab - q).T)
+
+
+class SegmentTreeTest(unittest.TestCase):
+    def test_nearest_matches_all_segments(self):
+        random = np.random.RandomState(0)
+        t = np.linspace(0, 1, 301)
+        points = np.cumsum(random.randn(301, 2), axis=0)
+        tree = SegmentTree(t, points)
+        self.assertEqual(len(tree), 300)
+
+        for scale in ((1, 1), (3, 0.5)):
+            for position in random.randn(50, 2) * 10:
+                _, distance = tree.nearest(position, scale)
+                expected = segment_distances(points, position, scale).min()
+                self.assertAlmostEqual(distance, expected)
+
+    def test_nearest_parameter_on_line(self):
+        tree = SegmentTree([0, 0.5, 1], [(0, 0), (1, 0), (2, 0)])
+        t, distance = tree.nearest((1.5, 2))
+        self.assertAlmostEqual(t, 0.75)
+        self.assertAlmostEqual(distance, 2)
+
+
+class ClosestPointTest(unittest.TestCase):
+    def test_closest_point_refines_sampled_one(self):
+        model = models.BezierModel('curve')
+        model.points = PointSet.from_array(
+            np.array([(0, 0), (1, 3), (3, -2), (4, 1)], dtype=float)
+        )
+        t = np.linspace(0, 1, 17)
+        tree = SegmentTree(t, model.evaluate(t))
+
+        dense = np.linspace(0, 1, 200001)
+        curve = model.evaluate(dense)
+        for position in ((2, 2), (0.5, -1), (5, 1), (1.8, 0.4)):
+            t_found, point, distance = closest_point(model, tree, position)
+            distances = np.hypot(*(curve - position).T)
+            self.assertLessEqual(distance, distances.min() + 1e-9)
+            np.testing.assert_allclose(
+                point, model.evaluate([t_found])[0]
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
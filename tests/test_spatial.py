@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'
+))
+
+from spatial import GridIndex  # noqa: E402
+
+
+class GridIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.random = np.random.RandomState(0)
+        self.points = self.random.rand(400, 2) * [100, 10]
+        self.index = GridIndex(self.points)
+
+    def expected(self, x, y, rx, ry):
+        distances = np.hypot(
+            (self.points[:, 0] - x) / rx, (self.points[:, 1] - y) / ry
+        )
+        best = np.argmin(distances)
+        if distances[best] > 1:
+            return None
+        return int(best), float(distances[best])
+
+    def check_queries(self):
+        for x, y in self.random.rand(200, 2) * [110, 11] - [5, 0.5]:
+            for rx, ry in ((1.0, 0.1), (5.0, 0.5), (300.0, 30.0)):
+                found = self.index.nearest(x, y, rx, ry)
+                expected = self.expected(x, y, rx, ry)
+                if expected is None:
+                    self.assertIsNone(found)
+                else:
+                    self.assertEqual(found[0], expected[0])
+                    self.assertAlmostEqual(found[1], expected[1])
+
+    def test_queries(self):
+        self.check_queries()
+
+    def test_queries_after_moves(self):
+        for i in (3, 17, 250):
+            self.points[i] = self.random.rand(2) * [100, 10]
+            self.index.move(i, self.points[i])
+        self.assertEqual(len(self.index.dirty), 3)
+        self.check_queries()
+
+    def test_queries_after_rebuild(self):
+        for i in range(60):
+            self.points[i] = self.random.rand(2) * [200, 20]
+            self.index.move(i, self.points[i])
+        self.assertLess(len(self.index.dirty), 60)
+        self.check_queries()
+
+    def test_queries_after_insert_and_remove(self):
+        for index in (0, 150, 400):
+            point = self.random.rand(2) * [100, 10]
+            self.points = np.insert(self.points, index, point, axis=0)
+            self.index.insert(index, point)
+        for index in (5, 151, 0, -1):
+            index %= len(self.points)
+            self.points = np.delete(self.points, index, axis=0)
+            self.index.remove(index)
+        self.assertEqual(len(self.index), len(self.points))
+        self.check_queries()
+
+    def test_empty_and_single_point(self):
+        self.assertIsNone(GridIndex().nearest(0, 0, 1, 1))
+        self.assertEqual(GridIndex([(2, 3)]).nearest(2, 3.5, 1, 1), (0, 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()